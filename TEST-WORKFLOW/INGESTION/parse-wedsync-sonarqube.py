@@ -3,19 +3,96 @@
 Parse WedSync SonarQube results (custom format) into TEST-WORKFLOW queue
 """
 
+from functools import lru_cache
 import json
 import os
 from pathlib import Path
 import sys
 
-def parse_wedsync_sonarqube(input_file, output_dir):
-    """Parse WedSync's custom SonarQube format"""
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is not installed
+    orjson = None
+
+if orjson is not None:
+    def dumps(obj, pretty=False):
+        """Serialize obj to UTF-8 JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    
+    loads = orjson.loads
+else:
+    def dumps(obj, pretty=False):
+        """Serialize obj to UTF-8 JSON bytes"""
+        if pretty:
+            return json.dumps(obj, indent=2).encode()
+        return json.dumps(obj, separators=(',', ':')).encode()
+    
+    loads = json.loads
+
+try:
+    import ijson
+except ImportError:  # Without ijson the whole input document is loaded at once
+    ijson = None
+
+def load_issue_sources(input_file):
+    """Return (categories, flat_issues) from a WedSync SonarQube report
+
+    categories is a sequence of (severity_key, issues) pairs taken from
+    error_categories; flat_issues is the optional top-level issues list, or
+    None when the report has none. With ijson installed both are streamed
+    from the file one issue at a time instead of loading the whole document.
+    """
+    if ijson is None:
+        with open(input_file, 'rb') as f:
+            data = loads(f.read())
+        
+        categories = [
+            (severity_key, severity_data['issues'])
+            for severity_key, severity_data in data.get('error_categories', {}).items()
+            if isinstance(severity_data, dict) and 'issues' in severity_data
+        ]
+        return categories, data.get('issues')
+    
+    # First pass: find which issue arrays exist without building any objects
+    category_keys = []
+    has_flat_issues = False
+    with open(input_file, 'rb', buffering=1 << 20) as f:
+        for prefix, event, _ in ijson.parse(f):
+            if event != 'start_array':
+                continue
+            if prefix == 'issues':
+                has_flat_issues = True
+                continue
+            parts = prefix.split('.')
+            if len(parts) == 3 and parts[0] == 'error_categories' and parts[2] == 'issues':
+                category_keys.append(parts[1])
+    
+    categories = [
+        (severity_key, stream_items(input_file, f"error_categories.{severity_key}.issues.item"))
+        for severity_key in category_keys
+    ]
+    flat_issues = stream_items(input_file, 'issues.item') if has_flat_issues else None
+    return categories, flat_issues
+
+def stream_items(input_file, prefix):
+    """Lazily yield the JSON values found under prefix"""
+    with open(input_file, 'rb', buffering=1 << 20) as f:
+        yield from ijson.items(f, prefix, use_float=True)
+
+def parse_wedsync_sonarqube(input_file, output_dir, shard=False, pretty=False):
+    """Parse WedSync's custom SonarQube format
+
+    With shard=True (--ndjson), issues are written to one NDJSON manifest
+    per severity (BY-SEVERITY/{severity}.ndjson) instead of one JSON file
+    per issue. Each run replaces the manifests it writes, so re-running a
+    report does not duplicate its issues.
+    Per-issue files are compact JSON unless pretty=True.
+    """
     
     print(f"📥 Parsing WedSync SonarQube Results")
     print(f"Input: {input_file}")
     
-    with open(input_file, 'r') as f:
-        data = json.load(f)
+    categories, flat_issues = load_issue_sources(input_file)
     
     total_processed = 0
     stats = {
@@ -26,76 +103,93 @@ def parse_wedsync_sonarqube(input_file, output_dir):
         'INFO': 0
     }
     
+    queue_root = Path(output_dir) / 'BY-SEVERITY'
+    queue_dirs = {}
+    shard_files = {}
+    
+    def write_issue(severity, fields):
+        # fields holds everything except the severity-only envelope keys
+        if pretty:
+            data = dumps({'id': fields['id'], **severity_envelope(severity), **fields}, pretty=True)
+        else:
+            data = encode_issue(severity, fields)
+        
+        if shard:
+            f = shard_files.get(severity)
+            if f is None:
+                queue_root.mkdir(parents=True, exist_ok=True)
+                # Written beside the manifest and swapped in once complete
+                f = open(queue_root / f"{severity}.ndjson.tmp", 'wb', buffering=1 << 20)
+                shard_files[severity] = f
+            f.write(data + b"\n")
+            return
+        
+        queue_dir = queue_dirs.get(severity)
+        if queue_dir is None:
+            queue_dir = queue_dirs[severity] = queue_root / severity
+            queue_dir.mkdir(parents=True, exist_ok=True)
+        
+        output_file = queue_dir / f"{fields['id']}.json"
+        output_file.write_bytes(data)
+    
     # Process each severity category
-    for severity_key, severity_data in data.get('error_categories', {}).items():
-        if isinstance(severity_data, dict) and 'issues' in severity_data:
-            issues = severity_data['issues']
-            severity = severity_key.upper()
+    for severity_key, issues in categories:
+        severity = severity_key.upper()
+        category_start = total_processed
+        
+        for issue in issues:
+            # Create structured error object (source, severity and
+            # verification_requirements come from the severity envelope)
+            error_obj = {
+                'id': issue.get('id', f"SQ-{total_processed:05d}"),
+                'rule': issue.get('rule', 'unknown'),
+                'type': issue.get('type', 'BUG'),
+                'file': issue.get('file', ''),
+                'line': issue.get('line', 0),
+                'message': issue.get('message', ''),
+                'effort': issue.get('effort', '5min'),
+                'auto_fixable': issue.get('auto_fixable', False),
+                'fix_strategy': issue.get('fix_strategy', ''),
+                'fix_instructions': generate_fix_instructions(issue),
+                'ref_mcp_queries': generate_ref_queries(issue),
+                'required_agents': select_agents(severity, issue.get('rule', '')),
+                'rollback_instructions': f"git checkout -- {issue.get('file', '')}"
+            }
             
-            print(f"\n📊 Processing {severity} issues: {len(issues)} found")
+            # Write to queue
+            write_issue(severity, error_obj)
             
-            for issue in issues:
-                # Create structured error object
-                error_obj = {
-                    'id': issue.get('id', f"SQ-{total_processed:05d}"),
-                    'source': 'SonarQube',
-                    'severity': severity,
-                    'rule': issue.get('rule', 'unknown'),
-                    'type': issue.get('type', 'BUG'),
-                    'file': issue.get('file', ''),
-                    'line': issue.get('line', 0),
-                    'message': issue.get('message', ''),
-                    'effort': issue.get('effort', '5min'),
-                    'auto_fixable': issue.get('auto_fixable', False),
-                    'fix_strategy': issue.get('fix_strategy', ''),
-                    'fix_instructions': generate_fix_instructions(issue),
-                    'verification_requirements': generate_verification_requirements(severity),
-                    'ref_mcp_queries': generate_ref_queries(issue),
-                    'required_agents': select_agents(severity, issue.get('rule', '')),
-                    'rollback_instructions': f"git checkout -- {issue.get('file', '')}"
-                }
-                
-                # Write to queue
-                queue_dir = Path(output_dir) / 'BY-SEVERITY' / severity
-                queue_dir.mkdir(parents=True, exist_ok=True)
-                
-                output_file = queue_dir / f"{error_obj['id']}.json"
-                with open(output_file, 'w') as f:
-                    json.dump(error_obj, f, indent=2)
-                
-                total_processed += 1
-                stats[severity] = stats.get(severity, 0) + 1
+            total_processed += 1
+            stats[severity] = stats.get(severity, 0) + 1
+        
+        print(f"\n📊 Processed {severity} issues: {total_processed - category_start} found")
     
     # Also check for flat issue list (if present)
-    if 'issues' in data:
+    if flat_issues is not None:
         print(f"\n📊 Processing additional issues list")
-        for issue in data['issues']:
+        for issue in flat_issues:
             severity = issue.get('severity', 'INFO').upper()
             
             error_obj = {
                 'id': f"SQ-{total_processed:05d}",
-                'source': 'SonarQube',
-                'severity': severity,
                 'rule': issue.get('rule', 'unknown'),
                 'file': issue.get('file', issue.get('component', '')),
                 'line': issue.get('line', 0),
                 'message': issue.get('message', ''),
                 'fix_instructions': issue.get('message', ''),
-                'verification_requirements': generate_verification_requirements(severity),
                 'ref_mcp_queries': generate_ref_queries(issue),
                 'required_agents': select_agents(severity, issue.get('rule', '')),
             }
             
-            queue_dir = Path(output_dir) / 'BY-SEVERITY' / severity
-            queue_dir.mkdir(parents=True, exist_ok=True)
-            
-            output_file = queue_dir / f"{error_obj['id']}.json"
-            with open(output_file, 'w') as f:
-                json.dump(error_obj, f, indent=2)
+            write_issue(severity, error_obj)
             
             total_processed += 1
             stats[severity] = stats.get(severity, 0) + 1
     
+    for severity, f in shard_files.items():
+        f.close()
+        os.replace(f.name, queue_root / f"{severity}.ndjson")
+    
     print(f"\n📊 Parsing Complete!")
     print("-" * 40)
     for severity, count in stats.items():
@@ -106,44 +200,72 @@ def parse_wedsync_sonarqube(input_file, output_dir):
     
     return stats
 
+@lru_cache(maxsize=None)
+def severity_envelope(severity):
+    """Fields of an error object that depend only on its severity"""
+    return {
+        'source': 'SonarQube',
+        'severity': severity,
+        'verification_requirements': generate_verification_requirements(severity),
+    }
+
+@lru_cache(maxsize=None)
+def envelope_prefix(severity):
+    """Compact JSON for severity_envelope() without its closing brace"""
+    return dumps(severity_envelope(severity))[:-1]
+
+def encode_issue(severity, fields):
+    """Compact JSON for an error object
+    
+    The severity envelope is serialized once per severity and spliced in
+    front of the per-issue fields, so only the varying part is encoded.
+    fields must be non-empty and must not repeat the envelope keys.
+    """
+    return envelope_prefix(severity) + b"," + dumps(fields)[1:]
+
 def generate_fix_instructions(issue):
     """Generate fix instructions from issue data"""
     if issue.get('fix_strategy'):
         return issue['fix_strategy']
     
     message = issue.get('message', '')
-    rule = issue.get('rule', '')
+    message_lower = message.lower()
     
-    if 'await' in message.lower():
+    if 'await' in message_lower:
         return 'Add or remove await keyword as appropriate'
-    elif 'unused' in message.lower():
+    elif 'unused' in message_lower:
         return 'Remove unused code'
-    elif 'break' in message.lower() or 'fall through' in message.lower():
+    elif 'break' in message_lower or 'fall through' in message_lower:
         return 'Add break statement to switch case'
     else:
         return f"Fix: {message[:100]}"
 
+CRITICAL_VERIFICATION = (
+    'Run full test suite',
+    'Deploy all verification agents',
+    'Check pattern compliance with Ref MCP',
+    'Verify no regressions',
+    'Production guardian approval'
+)
+MAJOR_VERIFICATION = (
+    'Run related tests',
+    'Pattern check with Ref MCP',
+    'Performance verification'
+)
+BASIC_VERIFICATION = (
+    'Basic verification',
+    'Build must pass'
+)
+
+VERIFICATION_BY_SEVERITY = {
+    'BLOCKER': CRITICAL_VERIFICATION,
+    'CRITICAL': CRITICAL_VERIFICATION,
+    'MAJOR': MAJOR_VERIFICATION,
+}
+
 def generate_verification_requirements(severity):
     """Generate verification requirements based on severity"""
-    if severity in ['BLOCKER', 'CRITICAL']:
-        return [
-            'Run full test suite',
-            'Deploy all verification agents',
-            'Check pattern compliance with Ref MCP',
-            'Verify no regressions',
-            'Production guardian approval'
-        ]
-    elif severity == 'MAJOR':
-        return [
-            'Run related tests',
-            'Pattern check with Ref MCP',
-            'Performance verification'
-        ]
-    else:
-        return [
-            'Basic verification',
-            'Build must pass'
-        ]
+    return VERIFICATION_BY_SEVERITY.get(severity, BASIC_VERIFICATION)
 
 def generate_ref_queries(issue):
     """Generate Ref MCP queries"""
@@ -156,30 +278,39 @@ def generate_ref_queries(issue):
         f"{rule} TypeScript fix"
     ]
 
+AGENTS_BY_SEVERITY = {
+    'BLOCKER': (
+        'pre-code-knowledge-gatherer',
+        'security-compliance-officer',
+        'test-automation-architect',
+        'production-guardian'
+    ),
+    'MAJOR': (
+        'pre-code-knowledge-gatherer',
+        'specification-compliance-overseer'
+    ),
+}
+AGENTS_BY_SEVERITY['CRITICAL'] = AGENTS_BY_SEVERITY['BLOCKER']
+
+@lru_cache(maxsize=4096)
 def select_agents(severity, rule):
     """Select verification agents"""
-    agents = []
-    
-    if severity in ['BLOCKER', 'CRITICAL']:
-        agents.extend([
-            'pre-code-knowledge-gatherer',
-            'security-compliance-officer',
-            'test-automation-architect',
-            'production-guardian'
-        ])
-    elif severity == 'MAJOR':
-        agents.extend([
-            'pre-code-knowledge-gatherer',
-            'specification-compliance-overseer'
-        ])
-    
-    if 'security' in rule.lower() or 'auth' in rule.lower():
-        agents.append('security-compliance-officer')
-    
-    return list(set(agents))
+    agents = AGENTS_BY_SEVERITY.get(severity, ())
+    
+    rule_lower = rule.lower()
+    if 'security' in rule_lower or 'auth' in rule_lower:
+        return tuple(dict.fromkeys(agents + ('security-compliance-officer',)))
+    
+    return agents
 
 if __name__ == "__main__":
-    input_file = sys.argv[1] if len(sys.argv) > 1 else '../QUEUES/INCOMING/SONARQUBE-TYPESCRIPT-ISSUES-20250909.json'
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else '../QUEUES'
+    # --ndjson (alias --shard): one NDJSON manifest per severity, replaced on each run
+    # --pretty: indent per-issue files for humans (queues are compact by default)
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    shard = '--ndjson' in flags or '--shard' in flags
+    pretty = '--pretty' in flags
+    input_file = args[0] if len(args) > 0 else '../QUEUES/INCOMING/SONARQUBE-TYPESCRIPT-ISSUES-20250909.json'
+    output_dir = args[1] if len(args) > 1 else '../QUEUES'
     
-    parse_wedsync_sonarqube(input_file, output_dir)
\ No newline at end of file
+    parse_wedsync_sonarqube(input_file, output_dir, shard=shard, pretty=pretty)
\ No newline at end of file
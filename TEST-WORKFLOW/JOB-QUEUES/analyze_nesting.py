@@ -3,12 +3,44 @@
 import sys
 import re
 
+try:
+    import numpy as np
+except ImportError:  # Fall back to per-line str.count when numpy is not installed
+    np = None
+
+# Lines that open a function/method or test block
+FUNCTION_START = re.compile(r'(function|=\s*\(|=>\s*{|it\(|describe\(|test\(|beforeEach|afterEach|beforeAll)')
+
+def brace_lines(data, lines):
+    """Yield (line_index, opens, closes) for every line containing a brace
+    
+    With numpy the whole file is scanned in a few vectorized passes: each
+    '{' / '}' byte is mapped to its line via the newline offsets and the
+    per-line totals come from bincount. UTF-8 never uses these ASCII bytes
+    inside multi-byte characters, so byte and character lines agree.
+    """
+    if np is None:
+        for i, line in enumerate(lines):
+            opens = line.count('{')
+            closes = line.count('}')
+            if opens or closes:
+                yield i, opens, closes
+        return
+    
+    buf = np.frombuffer(data.encode('utf-8', 'surrogatepass'), dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord('\n'))
+    opens = np.bincount(np.searchsorted(newlines, np.flatnonzero(buf == ord('{'))), minlength=len(lines))
+    closes = np.bincount(np.searchsorted(newlines, np.flatnonzero(buf == ord('}'))), minlength=len(lines))
+    
+    for i in np.flatnonzero(opens | closes).tolist():
+        yield i, int(opens[i]), int(closes[i])
+
 def analyze_nesting(file_path):
     """Analyze function nesting levels in a TypeScript test file"""
     
     try:
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
+        with open(file_path, 'r', buffering=1 << 18) as file:
+            data = file.read()
     except FileNotFoundError:
         print(f"Error: File not found: {file_path}")
         return
@@ -18,34 +50,41 @@ def analyze_nesting(file_path):
     in_function = False
     violations = []
     
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
+    # split('\n') rather than splitlines() so line numbers match editors
+    # even when the file contains form feeds or other Unicode separators
+    lines = data.split('\n')
+    
+    # Lines without braces never change the nesting state, so only visit
+    # the ones that have any; the function regex only runs on lines that
+    # open a block while we are not already inside a function
+    for i, opens, closes in brace_lines(data, lines):
+        line = lines[i]
         
         # Count opening braces that indicate function blocks
-        if re.search(r'\{', stripped):
+        if opens:
             # Check if this is a function/method definition
-            if re.search(r'(function|=\s*\(|=>\s*{|it\(|describe\(|test\(|beforeEach|afterEach|beforeAll)', stripped):
+            if not in_function and FUNCTION_START.search(line):
                 in_function = True
             
             if in_function:
-                current_nesting += stripped.count('{') - stripped.count('}')
+                current_nesting += opens - closes
                 if current_nesting > max_nesting:
                     max_nesting = current_nesting
                 
                 if current_nesting > 4:
+                    stripped = line.strip()
                     violations.append({
-                        'line': i,
+                        'line': i + 1,
                         'level': current_nesting,
                         'content': stripped[:100] + ('...' if len(stripped) > 100 else '')
                     })
         
         # Count closing braces
-        if re.search(r'\}', stripped):
-            if in_function:
-                current_nesting -= stripped.count('}') - stripped.count('{')
-                if current_nesting <= 0:
-                    in_function = False
-                    current_nesting = 0
+        if closes and in_function:
+            current_nesting -= closes - opens
+            if current_nesting <= 0:
+                in_function = False
+                current_nesting = 0
     
     print(f"Analysis for: {file_path}")
     print(f"Maximum nesting level found: {max_nesting}")
@@ -5,30 +5,74 @@ into individual job files for the 5-agent parallel army.
 NO SYNTHETIC DATA - REAL ISSUES ONLY!
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, repeat
 import json
-import uuid
 import os
 import re
+import sys
 from datetime import datetime
+from pathlib import Path
 
-def parse_issue_line(line):
-    """Parse a line from issues-by-file.txt into structured data."""
-    # Format: wedsync-2025:file:line - SEVERITY TYPE: Description
-    match = re.match(r'wedsync-2025:([^:]+):(\d+) - (\w+) (\w+): (.+)', line.strip())
-    if not match:
-        return None
-    
+# Format: wedsync-2025:file:line - SEVERITY TYPE: Description
+# Matched across the whole file at once; leading/trailing whitespace on a
+# line is ignored, as it was when each line was stripped and matched alone.
+ISSUE_LINE = re.compile(
+    rb'^[ \t\r\f\v]*wedsync-2025:([^:\n]+):(\d+) - (\w+) (\w+): ([^\n]*[^\s])[ \t\r\f\v]*$',
+    re.MULTILINE
+)
+
+def parse_issue_match(match):
+    """Turn an ISSUE_LINE match into structured issue data."""
     file_path, line_num, severity, issue_type, description = match.groups()
     
     return {
-        "file_path": file_path,
+        "file_path": file_path.decode(),
         "line": int(line_num),
-        "severity": severity,
-        "type": issue_type,
-        "message": description,
+        "severity": severity.decode(),
+        "type": issue_type.decode(),
+        "message": description.decode(),
         "project": "wedsync-2025"
     }
 
+SPEED_QUEUE = "REAL-SPEED-JOBS"
+DEEP_QUEUE = "REAL-DEEP-JOBS"
+
+def iter_issues(data):
+    """Yield structured issues from the report, warning about unparseable lines."""
+    line_num = 1
+    pos = 0
+    
+    for match in ISSUE_LINE.finditer(data):
+        line_num = report_unparsed_lines(data, pos, match.start(), line_num)
+        pos = match.end()
+        yield parse_issue_match(match)
+    
+    report_unparsed_lines(data, pos, len(data), line_num)
+
+def job_ids():
+    """Yield job ids in the same real-xxxxxxxx format the uuid4 prefix used.
+    
+    Only the starting point is random (one os.urandom call per run), so ids
+    are unique within a run and unlikely to clash with earlier runs' files.
+    """
+    start = int.from_bytes(os.urandom(4), "big")
+    for n in count(start):
+        yield f"real-{n & 0xFFFFFFFF:08x}"
+
+def report_unparsed_lines(data, start, end, line_num):
+    """Warn about non-blank lines in data[start:end] that did not match.
+    
+    line_num is the line number at offset start; returns the line number at end.
+    """
+    for offset, line in enumerate(data[start:end].split(b"\n")):
+        if line.strip():
+            text = line.strip().decode(errors="replace")
+            print(f"⚠️  Could not parse line {line_num + offset}: {text[:50]}...")
+    return line_num + data.count(b"\n", start, end)
+
+# Keyword routing stays as plain substring checks: `in` runs in C and
+# short-circuits, which beats a compiled regex alternation in CPython.
 def calculate_complexity(issue):
     """Calculate complexity score (1-10) to route to Speed vs Deep agents."""
     message = issue["message"].lower()
@@ -58,8 +102,13 @@ def calculate_complexity(issue):
     
     return 4  # Default to speed
 
-def create_job_file(issue, job_id, output_dir):
-    """Create a job file for the parallel agents."""
+def create_job_file(issue, job_id, queue_dirs, created_at, pretty=False):
+    """Create a job file for the parallel agents.
+    
+    queue_dirs is the (speed, deep) pair of existing queue directories and
+    created_at the run timestamp shared by every job in this conversion.
+    Jobs are written as compact JSON unless pretty is set.
+    """
     complexity = calculate_complexity(issue)
     
     job_data = {
@@ -77,23 +126,25 @@ def create_job_file(issue, job_id, output_dir):
         "estimated_time_minutes": 5 if complexity <= 5 else 20,
         "requires_agents": ["security-officer"] if complexity >= 7 else [],
         "source": "real-sonarqube-issues",
-        "created_at": datetime.now().isoformat()
+        "created_at": created_at
     }
     
     # Route to appropriate queue
+    speed_dir, deep_dir = queue_dirs
     if complexity <= 5:
-        job_file = os.path.join(output_dir, "REAL-SPEED-JOBS", f"{job_id}.json")
+        job_file = f"{speed_dir}/{job_id}.json"
     else:
-        job_file = os.path.join(output_dir, "REAL-DEEP-JOBS", f"{job_id}.json")
-    
-    os.makedirs(os.path.dirname(job_file), exist_ok=True)
+        job_file = f"{deep_dir}/{job_id}.json"
     
     with open(job_file, 'w') as f:
-        json.dump(job_data, f, indent=2)
+        if pretty:
+            json.dump(job_data, f, indent=2)
+        else:
+            json.dump(job_data, f, separators=(',', ':'))
     
     return "SPEED" if complexity <= 5 else "DEEP"
 
-def main():
+def main(pretty=False):
     print("🚀 CONVERTING 500+ REAL ISSUES TO PARALLEL AGENT JOBS...")
     print("=" * 60)
     
@@ -106,19 +157,25 @@ def main():
     speed_jobs = 0
     deep_jobs = 0
     
-    with open(issues_file, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            if not line.strip():
-                continue
-                
-            issue = parse_issue_line(line)
-            if not issue:
-                print(f"⚠️  Could not parse line {line_num}: {line.strip()[:50]}...")
-                continue
-            
-            job_id = f"real-{str(uuid.uuid4())[:8]}"
-            job_type = create_job_file(issue, job_id, ".")
-            
+    # One pass of the regex engine over the whole file instead of one
+    # re.match() call per line; gaps between matches are unparseable lines
+    data = Path(issues_file).read_bytes()
+    
+    queue_dirs = (os.path.join(".", SPEED_QUEUE), os.path.join(".", DEEP_QUEUE))
+    for queue_dir in queue_dirs:
+        os.makedirs(queue_dir, exist_ok=True)
+    
+    created_at = datetime.now().isoformat()
+    
+    # Job files are small and independent, so overlap their writes; file
+    # I/O releases the GIL
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        job_types = executor.map(
+            create_job_file, iter_issues(data), job_ids(), repeat(queue_dirs), repeat(created_at),
+            repeat(pretty)
+        )
+        
+        for job_type in job_types:
             if job_type == "SPEED":
                 speed_jobs += 1
             else:
@@ -134,4 +191,5 @@ def main():
     print(f"\n🚀 Your 5-agent army now has {speed_jobs + deep_jobs} REAL jobs to process!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # --pretty: indent job files for humans; agents read the compact default
+    main(pretty="--pretty" in sys.argv[1:])
\ No newline at end of file
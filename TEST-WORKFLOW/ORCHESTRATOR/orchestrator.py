@@ -21,13 +21,165 @@ import os
 import sys
 import argparse
 import subprocess
+import time
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Iterator, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice
 import hashlib
+import re
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is not installed
+    orjson = None
+
+if orjson is not None:
+    def dumps(obj, pretty=False):
+        """Serialize obj to UTF-8 JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+else:
+    def dumps(obj, pretty=False):
+        """Serialize obj to UTF-8 JSON bytes"""
+        if pretty:
+            return json.dumps(obj, indent=2).encode()
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+try:
+    import numpy as np
+except ImportError:  # Complexity is then scored one issue at a time
+    np = None
+
+try:
+    import ijson
+except ImportError:  # Without ijson each report is loaded into memory at once
+    ijson = None
+
+# Rule fragments are matched as substrings: SonarQube rule keys carry a
+# language prefix (e.g. "typescript:S2068")
+SECURITY_RULES = ('S2068', 'S2070', 'S3649', 'S4502', 'S5122')
+PERFORMANCE_RULES = ('S1854', 'S1481', 'S3776')
+MAINTAINABILITY_RULES = ('S3516', 'S128', 'S1172')
+
+# TypeScript error codes are exact, so category and severity come from one lookup
+TS_ERROR_TABLE = {
+    '2345': ('types', 'MAJOR'),
+    '2322': ('types', 'MAJOR'),
+    '2339': ('types', 'MAJOR'),
+    '2304': ('types', 'MINOR'),
+    '1308': ('async', 'MINOR'),
+    '2335': ('async', 'MINOR'),
+    '2794': ('async', 'MINOR'),
+    '2307': ('imports', 'MINOR'),
+    '2306': ('imports', 'MINOR'),
+    '2305': ('imports', 'MINOR'),
+    '1005': ('syntax', 'CRITICAL'),  # Syntax errors
+    '1109': ('syntax', 'CRITICAL'),
+    '1128': ('syntax', 'CRITICAL'),
+}
+TS_ERROR_DEFAULT = ('syntax', 'MINOR')
+
+# file.ts(123,45): error TS2345: Message -> (file, line, code, message); the position is optional.
+# The path is matched lazily up to the position suffix so route groups like app/(dashboard)/ survive.
+TS_ERROR_LINE = re.compile(r'(.*?)(?:\((\d+),\d+\))?: error TS(\d+):\s*(.*)')
+
+RULE_PATTERNS = {
+    'S3516': 'pattern-single-return',
+    'S128': 'pattern-switch-cases',
+    '2794': 'pattern-async-await',
+    '2307': 'pattern-import-fixes',
+    '2345': 'pattern-type-assertions'
+}
+
+# Queues reported by get_queue_status
+STATUS_QUEUES = ('SPEED-JOBS', 'DEEP-JOBS', 'SKIP-JOBS')
+
+PROGRESS_INTERVAL = 1.0  # Minimum seconds between progress lines
+
+KNOWN_FIX_COMMIT = 'b0b8db54'  # Known fix commit from session report
+
+# Routing is dominated by git subprocess waits, which release the GIL
+ROUTING_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Complexity: base score by severity, plus extra for risky categories
+SEVERITY_SCORES = {
+    'BLOCKER': 8,
+    'CRITICAL': 6,
+    'MAJOR': 4,
+    'MINOR': 2,
+    'INFO': 1
+}
+CATEGORY_SCORES = {'security': 4, 'performance': 2}
+
+SENSITIVE_PATH = re.compile(r'/(?:api|auth|payment|marketplace)/')
+
+JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if ijson else (json.JSONDecodeError,)
+
+def load_sonarqube_sources(file_path: str):
+    """Return (categories, issues) for a SonarQube report
+
+    categories is a list of (severity_key, issues) pairs taken from a WedSync
+    error_categories report, or None for a standard report, in which case
+    issues holds the top-level issues array. With ijson installed the issue
+    arrays are streamed from the file one issue at a time.
+    """
+    if ijson is None:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if 'error_categories' in data:
+            categories = [
+                (severity, category_data.get('issues', []))
+                for severity, category_data in data['error_categories'].items()
+            ]
+            return categories, None
+        return None, data.get('issues', [])
+    
+    # First pass: scan parser events for the category keys without building any objects
+    category_keys = None
+    with open(file_path, 'rb', buffering=1 << 20) as f:
+        for prefix, event, value in ijson.parse(f):
+            if event != 'map_key':
+                continue
+            if prefix == '' and value == 'error_categories':
+                category_keys = []
+            elif prefix == 'error_categories':
+                category_keys.append(value)
+    
+    if category_keys is None:
+        return None, stream_items(file_path, 'issues.item')
+    categories = [
+        (severity, stream_items(file_path, f"error_categories.{severity}.issues.item"))
+        for severity in category_keys
+    ]
+    return categories, None
+
+def stream_items(file_path: str, prefix: str) -> Iterator[Any]:
+    """Lazily yield the JSON values found under prefix"""
+    with open(file_path, 'rb', buffering=1 << 20) as f:
+        yield from ijson.items(f, prefix, use_float=True)
+
+@lru_cache(maxsize=4096)
+def pattern_key(rule_id: str) -> str:
+    """Pattern library key for a rule id (e.g. TS2794 -> typescript-2794), normalized once per rule"""
+    return rule_id.lower().replace('ts', 'typescript-')
+
+def short_hash(key: str) -> str:
+    """8-hex-char id suffix for a file/line key (blake2b with a 4-byte digest)"""
+    return hashlib.blake2b(key.encode('utf-8', 'ignore'), digest_size=4).hexdigest()
+
+def announce(issues: Iterable['Issue'], header: str, footer: str) -> Iterator['Issue']:
+    """Pass issues through, printing header when the source starts and footer.format(count) when it is exhausted"""
+    print(header)
+    count = 0
+    for count, issue in enumerate(issues, 1):
+        yield issue
+    print(footer.format(count))
+
+@dataclass(slots=True)
 class Issue:
     id: str
     source: str  # sonarqube, typescript, eslint
@@ -39,7 +191,11 @@ class Issue:
     category: str
     raw_data: Dict[str, Any]
 
-@dataclass  
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field dict for serialization (asdict would deep-copy raw_data)"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+@dataclass(slots=True)
 class Job:
     id: str
     issue: Issue
@@ -52,6 +208,12 @@ class Job:
     similar_fixes: List[str]
     created_at: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Field dict for serialization; nested values are referenced, not copied"""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['issue'] = self.issue.to_dict()
+        return data
+
 class WedSyncOrchestrator:
     def __init__(self, base_path: str):
         self.base_path = Path(base_path)
@@ -72,6 +234,16 @@ class WedSyncOrchestrator:
             'skip_jobs': 0,
             'failed_routing': 0
         }
+        
+        # Git history used for routing, loaded once by _prefetch_git_context
+        self._commit_log = None
+        self._repo_root = None
+        self._known_fix_files = frozenset()
+        self._similar_fixes = {}
+        
+        # Job files per queue, seeded from disk once and kept current by save_job
+        self.queue_jobs = {queue_type: set() for queue_type in STATUS_QUEUES}
+        self._scan_queue_jobs()
 
     def setup_directories(self):
         """Create the job queue directory structure"""
@@ -90,8 +262,12 @@ class WedSyncOrchestrator:
             "ORCHESTRATOR"
         ]
         
+        # Remembered so save_job only creates queue dirs outside this layout
+        self._ensured_dirs = set()
         for dir_path in dirs:
-            (self.base_path / dir_path).mkdir(parents=True, exist_ok=True)
+            queue_dir = self.base_path / dir_path
+            queue_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(queue_dir)
 
     def load_patterns(self) -> Dict[str, Any]:
         """Load known fix patterns from library"""
@@ -133,32 +309,41 @@ class WedSyncOrchestrator:
             
         return default_patterns
 
-    def ingest_sonarqube(self, file_path: str) -> List[Issue]:
-        """Ingest SonarQube JSON results (handles both standard and WedSync custom format)"""
+    def ingest_sonarqube(self, file_path: str) -> Iterator[Issue]:
+        """Ingest SonarQube JSON results (handles both standard and WedSync custom format)
+
+        Issues are yielded as they are parsed. An unreadable report is skipped
+        from the point where the error is hit.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            yield from self._parse_sonarqube(file_path)
         except UnicodeDecodeError:
             print(f"   ⚠️  Encoding error in {file_path} (skipping)")
-            return []
-        except json.JSONDecodeError:
+        except JSON_ERRORS:
             print(f"   ⚠️  Invalid JSON in {file_path} (skipping)")
-            return []
-        
-        issues = []
+
+    def _parse_sonarqube(self, file_path: str) -> Iterator[Issue]:
+        # Strings built per issue (severity, rule ids, parsed paths) are interned
+        # across the ingest paths: only a handful of distinct values repeat over
+        # thousands of issues. Values taken straight from the report stay
+        # referenced by raw_data, so interning them would save nothing.
+        categories, items = load_sonarqube_sources(file_path)
         
         # Check if it's WedSync custom format
-        if 'error_categories' in data:
+        if categories is not None:
             # WedSync custom format
-            for severity, category_data in data['error_categories'].items():
-                for item in category_data.get('issues', []):
-                    file_line_key = f"{item.get('file')}{item.get('line')}"
-                    hash_suffix = hashlib.md5(file_line_key.encode()).hexdigest()[:8]
+            for severity, category_issues in categories:
+                for item in category_issues:
+                    if 'id' in item:
+                        issue_id = item['id']
+                    else:
+                        hash_suffix = short_hash(f"{item.get('file')}{item.get('line')}")
+                        issue_id = f"sonar-{item.get('rule')}-{hash_suffix}"
                     
-                    issue = Issue(
-                        id=item.get('id', f"sonar-{item.get('rule')}-{hash_suffix}"),
+                    yield Issue(
+                        id=issue_id,
                         source='sonarqube',
-                        severity=item.get('severity', severity).upper(),
+                        severity=sys.intern(item.get('severity', severity).upper()),
                         rule_id=item.get('rule', ''),
                         file_path=item.get('file', ''),
                         line=item.get('line', 0),
@@ -166,16 +351,14 @@ class WedSyncOrchestrator:
                         category=self.categorize_sonar_rule(item.get('rule', '')),
                         raw_data=item
                     )
-                    issues.append(issue)
         else:
             # Standard SonarQube format
-            for item in data.get('issues', []):
-                component_line = f"{item.get('component')}{item.get('line')}"
-                hash_suffix = hashlib.md5(component_line.encode()).hexdigest()[:8]
-                issue = Issue(
+            for item in items:
+                hash_suffix = short_hash(f"{item.get('component')}{item.get('line')}")
+                yield Issue(
                     id=f"sonar-{item.get('rule')}-{hash_suffix}",
                     source='sonarqube',
-                    severity=item.get('severity', 'UNKNOWN').upper(),
+                    severity=sys.intern(item.get('severity', 'UNKNOWN').upper()),
                     rule_id=item.get('rule', ''),
                     file_path=item.get('component', ''),
                     line=item.get('line', 0),
@@ -183,34 +366,29 @@ class WedSyncOrchestrator:
                     category=self.categorize_sonar_rule(item.get('rule', '')),
                     raw_data=item
                 )
-                issues.append(issue)
-            
-        return issues
 
-    def ingest_coderabbit(self, file_path: str) -> List[Issue]:
-        """Ingest CodeRabbit JSON results"""
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+    def ingest_coderabbit(self, file_path: str) -> Iterator[Issue]:
+        """Ingest CodeRabbit JSON results, yielding issues as they are parsed"""
+        if ijson is None:
+            with open(file_path, 'r') as f:
+                items = json.load(f)
+        else:
+            items = stream_items(file_path, 'item')
         
-        issues = []
-        for item in data:
-            file_line_key = f"{item.get('file')}{item.get('line')}"
-            hash_suffix = hashlib.md5(file_line_key.encode()).hexdigest()[:8]
+        for item in items:
+            hash_suffix = short_hash(f"{item.get('file')}{item.get('line')}")
             
-            issue = Issue(
+            yield Issue(
                 id=f"cr-{item.get('pr')}-{hash_suffix}",
                 source='coderabbit',
                 severity=self.map_coderabbit_severity(item.get('severity', 'minor')),
-                rule_id=f"CR-{item.get('severity', 'refactor')}",
+                rule_id=sys.intern(f"CR-{item.get('severity', 'refactor')}"),
                 file_path=item.get('file', ''),
                 line=item.get('line', 0),
                 message=item.get('summary', ''),
                 category='refactor',
                 raw_data=item
             )
-            issues.append(issue)
-            
-        return issues
 
     def map_coderabbit_severity(self, severity: str) -> str:
         """Map CodeRabbit severity to standard levels"""
@@ -223,84 +401,65 @@ class WedSyncOrchestrator:
         }
         return severity_map.get(severity.lower(), 'MINOR')
 
-    def ingest_typescript(self, file_path: str) -> List[Issue]:
-        """Ingest TypeScript error output"""
-        issues = []
+    def ingest_typescript(self, file_path: str) -> Iterator[Issue]:
+        """Ingest TypeScript error output, yielding issues line by line"""
+        unmatched = 0
         with open(file_path, 'r') as f:
-            for line_num, line in enumerate(f):
-                if 'error TS' in line:
-                    # Parse: file.ts(123,45): error TS2345: Message
-                    parts = line.strip().split(': error TS')
-                    if len(parts) >= 2:
-                        file_info = parts[0]
-                        error_info = parts[1]
-                        
-                        file_path = file_info.split('(')[0]
-                        line_info = file_info.split('(')[1].split(')')[0] if '(' in file_info else '0,0'
-                        line_number = int(line_info.split(',')[0]) if line_info else 0
-                        
-                        error_code = error_info.split(':')[0]
-                        message = ':'.join(error_info.split(':')[1:]).strip()
-                        
-                        file_line_key = f"{file_path}{line_number}"
-                        hash_suffix = hashlib.md5(file_line_key.encode()).hexdigest()[:8]
-                        
-                        issue = Issue(
-                            id=f"ts-{error_code}-{hash_suffix}",
-                            source='typescript',
-                            severity=self.map_ts_severity(error_code),
-                            rule_id=f"TS{error_code}",
-                            file_path=file_path,
-                            line=line_number,
-                            message=message,
-                            category=self.categorize_ts_error(error_code),
-                            raw_data={'original_line': line.strip()}
-                        )
-                        issues.append(issue)
+            for line in f:
+                # The substring check rejects context lines far faster than a failed regex match
+                if 'error TS' not in line:
+                    continue
+                    
+                # Parse: file.ts(123,45): error TS2345: Message
+                original_line = line.strip()
+                match = TS_ERROR_LINE.match(original_line)
+                if not match:
+                    unmatched += 1
+                    continue
+                    
+                error_path, line_info, error_code, message = match.groups()
+                line_number = int(line_info) if line_info else 0
+                
+                hash_suffix = short_hash(f"{error_path}{line_number}")
+                category, severity = TS_ERROR_TABLE.get(error_code, TS_ERROR_DEFAULT)
+                
+                yield Issue(
+                    id=f"ts-{error_code}-{hash_suffix}",
+                    source='typescript',
+                    severity=severity,
+                    rule_id=sys.intern(f"TS{error_code}"),
+                    file_path=sys.intern(error_path),
+                    line=line_number,
+                    message=message,
+                    category=category,
+                    raw_data={'original_line': original_line}
+                )
         
-        return issues
+        if unmatched:
+            print(f"   ⚠️  {unmatched} TypeScript error lines in {file_path} could not be parsed (skipping)")
 
-    def categorize_sonar_rule(self, rule: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def categorize_sonar_rule(rule: str) -> str:
         """Categorize SonarQube rules"""
-        security_rules = ['S2068', 'S2070', 'S3649', 'S4502', 'S5122']
-        performance_rules = ['S1854', 'S1481', 'S3776']
-        maintainability_rules = ['S3516', 'S128', 'S1172']
-        
-        if any(r in rule for r in security_rules):
+        if any(r in rule for r in SECURITY_RULES):
             return 'security'
-        elif any(r in rule for r in performance_rules):
+        elif any(r in rule for r in PERFORMANCE_RULES):
             return 'performance'
-        elif any(r in rule for r in maintainability_rules):
+        elif any(r in rule for r in MAINTAINABILITY_RULES):
             return 'maintainability'
         else:
             return 'general'
 
-    def categorize_ts_error(self, error_code: str) -> str:
+    @staticmethod
+    def categorize_ts_error(error_code: str) -> str:
         """Categorize TypeScript errors"""
-        type_errors = ['2345', '2322', '2339', '2304']
-        async_errors = ['1308', '2335', '2794']
-        import_errors = ['2307', '2306', '2305']
-        
-        if error_code in type_errors:
-            return 'types'
-        elif error_code in async_errors:
-            return 'async'
-        elif error_code in import_errors:
-            return 'imports'
-        else:
-            return 'syntax'
+        return TS_ERROR_TABLE.get(error_code, TS_ERROR_DEFAULT)[0]
 
-    def map_ts_severity(self, error_code: str) -> str:
+    @staticmethod
+    def map_ts_severity(error_code: str) -> str:
         """Map TypeScript error codes to severity levels"""
-        critical_errors = ['1005', '1109', '1128']  # Syntax errors
-        major_errors = ['2345', '2322', '2339']     # Type errors
-        
-        if error_code in critical_errors:
-            return 'CRITICAL'
-        elif error_code in major_errors:
-            return 'MAJOR'
-        else:
-            return 'MINOR'
+        return TS_ERROR_TABLE.get(error_code, TS_ERROR_DEFAULT)[1]
 
     def check_already_resolved(self, issue: Issue) -> bool:
         """Check if issue is already resolved via git blame/status"""
@@ -311,21 +470,20 @@ class WedSyncOrchestrator:
         # For existing issues, use git checking
         try:
             # Check if file still exists
-            full_path = Path(issue.file_path)
-            if not full_path.exists():
+            if not self._file_still_exists(issue.file_path):
                 return True
-                
-            # Check git blame on the specific line
-            result = subprocess.run([
-                'git', 'blame', '-L', f'{issue.line},{issue.line}', str(full_path)
-            ], capture_output=True, text=True, cwd=self.base_path.parent)
             
-            if result.returncode != 0:
+            # Blame can only point at the fix commit for files that commit touched
+            if self._commit_log is None:
+                self._prefetch_git_context()
+            if not self._known_fix_files:
+                return False
+            if self._repo_path(self._repo_root, self.base_path.parent, issue.file_path) not in self._known_fix_files:
                 return False
                 
             # Check if the line was modified recently (after known fix commits)
-            blame_output = result.stdout.strip()
-            if 'b0b8db54' in blame_output:  # Known fix commit from session report
+            commit = self._blame_line(issue.file_path, issue.line)
+            if commit and commit.startswith(KNOWN_FIX_COMMIT):
                 return True
                 
         except Exception as e:
@@ -333,56 +491,145 @@ class WedSyncOrchestrator:
             
         return False
 
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _file_still_exists(file_path: str) -> bool:
+        """Cached existence check; many issues share a file"""
+        return Path(file_path).exists()
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _repo_path(repo_root: str, cwd: Path, file_path: str) -> str:
+        """file_path (absolute, or relative to cwd) relative to the repository root, as git names it"""
+        return os.path.relpath(os.path.realpath(os.path.join(cwd, file_path)), repo_root)
+
+    def _blame_line(self, file_path: str, line: int) -> Optional[str]:
+        """Return the full hash of the commit that last touched line, or None"""
+        commits = self._blame_file(self.base_path.parent, str(Path(file_path)))
+        if not isinstance(line, int) or not 0 < line <= len(commits):
+            return None
+        return commits[line - 1]
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _blame_file(repo: Path, file_path: str) -> tuple:
+        """Blame a whole file once; issues usually cluster many lines per file"""
+        result = subprocess.run([
+            'git', 'blame', '--porcelain', file_path
+        ], capture_output=True, text=True, cwd=repo)
+        
+        if result.returncode != 0:
+            return ()
+            
+        # Each blamed line starts with a "<hash> <orig-line> <final-line>[ <group-size>]" header
+        commits = []
+        for line in result.stdout.split('\n'):
+            fields = line.split(' ')
+            if len(fields[0]) == 40 and len(fields) in (3, 4):
+                commits.append(fields[0])
+        return tuple(commits)
+
     def calculate_complexity(self, issue: Issue) -> int:
         """Score issue complexity (1-10, 1=simple, 10=complex)"""
-        score = 0
-        
-        # Base score by severity
-        severity_scores = {
-            'BLOCKER': 8,
-            'CRITICAL': 6, 
-            'MAJOR': 4,
-            'MINOR': 2,
-            'INFO': 1
-        }
-        score += severity_scores.get(issue.severity, 3)
-        
-        # Pattern complexity from library
-        pattern_key = issue.rule_id.lower().replace('ts', 'typescript-')
-        if pattern_key in self.patterns:
-            score = self.patterns[pattern_key].get('complexity', score)
+        score = self._base_complexity(issue)
         
         # File path complexity (security-sensitive areas)
-        sensitive_paths = ['/api/', '/auth/', '/payment/', '/marketplace/']
-        if any(path in issue.file_path.lower() for path in sensitive_paths):
+        if SENSITIVE_PATH.search(issue.file_path.lower()):
             score += 3
             
-        # Category complexity  
-        if issue.category == 'security':
-            score += 4
-        elif issue.category == 'performance':
-            score += 2
+        # Category complexity
+        score += CATEGORY_SCORES.get(issue.category, 0)
             
         return min(score, 10)
 
-    def find_similar_fixes(self, issue: Issue) -> List[str]:
-        """Find similar fixes from git history"""
+    def score_complexities(self, issues: List[Issue]) -> List[int]:
+        """Score a batch of issues; same results as calculate_complexity per issue
+
+        With numpy the path, category and cap terms are applied to the whole
+        batch as arrays instead of per issue.
+        """
+        if np is None or not issues:
+            return [self.calculate_complexity(issue) for issue in issues]
+        
+        count = len(issues)
+        base = np.fromiter((self._base_complexity(issue) for issue in issues), dtype=np.int16, count=count)
+        sensitive = np.fromiter(
+            (SENSITIVE_PATH.search(issue.file_path.lower()) is not None for issue in issues),
+            dtype=bool, count=count)
+        category = np.fromiter(
+            (CATEGORY_SCORES.get(issue.category, 0) for issue in issues), dtype=np.int16, count=count)
+        return np.minimum(base + 3 * sensitive + category, 10).tolist()
+
+    def _base_complexity(self, issue: Issue) -> int:
+        """Severity score, overridden by the pattern library's complexity for known rules"""
+        score = SEVERITY_SCORES.get(issue.severity, 3)
+        
+        # Pattern complexity from library
+        key = pattern_key(issue.rule_id)
+        if key in self.patterns:
+            score = self.patterns[key].get('complexity', score)
+        return score
+
+    def _prefetch_git_context(self):
+        """Load the git history used for routing with a few git calls instead of two per issue
+
+        Reads every commit message once for find_similar_fixes and the files
+        touched by the known fix commit for check_already_resolved.
+        """
+        self._commit_log = []
         try:
-            # Search for commits that fixed similar rule violations
             result = subprocess.run([
-                'git', 'log', '--grep', issue.rule_id, '--oneline', '-n', '5'
+                'git', 'log', '--format=%h%x00%B%x00'
             ], capture_output=True, text=True, cwd=self.base_path.parent)
             
             if result.returncode == 0:
-                return [line.split()[0] for line in result.stdout.strip().split('\n') if line]
+                fields = result.stdout.split('\0')
+                self._commit_log = [
+                    (commit.strip(), message)
+                    for commit, message in zip(fields[0::2], fields[1::2])
+                ]
+                
+            # Fix commit paths are relative to the repository root, and issue
+            # paths are mapped onto the same root before they are compared
+            result = subprocess.run([
+                'git', 'rev-parse', '--show-toplevel'
+            ], capture_output=True, text=True, cwd=self.base_path.parent)
+            
+            if result.returncode == 0:
+                self._repo_root = result.stdout.strip()
+                result = subprocess.run([
+                    'git', 'show', '-z', '--name-only', '--format=', KNOWN_FIX_COMMIT
+                ], capture_output=True, text=True, cwd=self.base_path.parent)
+                
+                if result.returncode == 0:
+                    self._known_fix_files = frozenset(result.stdout.split('\0')) - {''}
                 
-        except Exception:
-            pass
+        except Exception as e:
+            print(f"Warning: Could not read git history: {e}")
+
+    def find_similar_fixes(self, issue: Issue) -> List[str]:
+        """Find similar fixes from git history"""
+        if self._commit_log is None:
+            self._prefetch_git_context()
             
-        return []
+        # Search for commits that fixed similar rule violations (newest 5, like git log --grep -n 5)
+        fixes = self._similar_fixes.get(issue.rule_id)
+        if fixes is None:
+            fixes = list(islice(
+                (commit for commit, message in self._commit_log if issue.rule_id in message), 5
+            ))
+            self._similar_fixes[issue.rule_id] = fixes
+            
+        return list(fixes)
+
+    def route_issue(self, issue: Issue, complexity: Optional[int] = None, now: Optional[str] = None) -> Job:
+        """Route issue to appropriate job queue
 
-    def route_issue(self, issue: Issue) -> Job:
-        """Route issue to appropriate job queue"""
+        complexity may be passed in when it was already scored for the batch,
+        and now is the shared created_at timestamp of the processing run.
+        """
+        now = now or datetime.now().isoformat()
+        
         # Check if already resolved
         if self.check_already_resolved(issue):
             return Job(
@@ -395,11 +642,12 @@ class WedSyncOrchestrator:
                 requires_agents=[],
                 verification_level="NONE",
                 similar_fixes=[],
-                created_at=datetime.now().isoformat()
+                created_at=now
             )
         
         # Calculate complexity
-        complexity = self.calculate_complexity(issue)
+        if complexity is None:
+            complexity = self.calculate_complexity(issue)
         similar_fixes = self.find_similar_fixes(issue)
         
         # Route based on complexity
@@ -416,7 +664,7 @@ class WedSyncOrchestrator:
                 requires_agents=[],
                 verification_level="BASIC",
                 similar_fixes=similar_fixes,
-                created_at=datetime.now().isoformat()
+                created_at=now
             )
         else:
             # DEEP JOB
@@ -436,21 +684,19 @@ class WedSyncOrchestrator:
                 requires_agents=agents_needed,
                 verification_level="COMPREHENSIVE",
                 similar_fixes=similar_fixes,
-                created_at=datetime.now().isoformat()
+                created_at=now
             )
 
     def get_pattern_name(self, issue: Issue) -> str:
         """Get pattern name for speed job routing"""
-        rule_patterns = {
-            'S3516': 'pattern-single-return',
-            'S128': 'pattern-switch-cases',
-            '2794': 'pattern-async-await',
-            '2307': 'pattern-import-fixes',
-            '2345': 'pattern-type-assertions'
-        }
-        
-        for rule_fragment, pattern in rule_patterns.items():
-            if rule_fragment in issue.rule_id:
+        return self.pattern_for_rule(issue.rule_id)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def pattern_for_rule(rule_id: str) -> str:
+        """Map a rule id to its speed-job pattern queue"""
+        for rule_fragment, pattern in RULE_PATTERNS.items():
+            if rule_fragment in rule_id:
                 return pattern
                 
         return 'pattern-general'
@@ -474,29 +720,63 @@ class WedSyncOrchestrator:
         else:
             queue_dir = self.job_queues_path / "FAILED-ROUTING"
             
-        queue_dir.mkdir(parents=True, exist_ok=True)
+        if queue_dir not in self._ensured_dirs:
+            queue_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(queue_dir)
         
         # Save job file
         job_file = queue_dir / f"{job.id}.json"
-        with open(job_file, 'w') as f:
-            json.dump(asdict(job), f, indent=2)
+        job_file.write_bytes(dumps(job.to_dict(), pretty=True))
+        
+        # Status counts the jobs in each queue's subdirectories
+        queued = self.queue_jobs.get(queue_dir.parent.name)
+        if queued is not None:
+            queued.add(f"{queue_dir.name}/{job_file.name}")
             
         # Update stats
         self.stats[f'{job.job_type.lower()}_jobs'] += 1
 
-    def process_issues(self, issues: List[Issue]):
-        """Process all issues and create job queues"""
-        print(f"\n🏗️  Processing {len(issues)} issues...")
+    def process_issues(self, issues: Iterable[Issue]):
+        """Process issues as they are ingested and create job queues
+
+        Issues are read in batches and routed on a thread pool, most complex
+        first within each batch, while the previous batch's jobs are saved in
+        ingest order from this thread. Only two batches are in flight, so the
+        issue stream is never read far ahead.
+        """
+        print(f"\n🏗️  Processing issues...")
+        self._prefetch_git_context()
         
-        for i, issue in enumerate(issues):
-            if i % 100 == 0:
-                print(f"   Processed {i}/{len(issues)} issues...")
+        issues = iter(issues)
+        now = datetime.now().isoformat()  # One created_at for every job in the run
+        batch_size = ROUTING_WORKERS * 4
+        count = 0
+        next_progress = 0.0
+        with ThreadPoolExecutor(max_workers=ROUTING_WORKERS) as executor:
+            previous = []
+            while True:
+                batch = list(islice(issues, batch_size))
+                
+                # Dispatch deep-job candidates ahead of trivial ones (stable for equal scores)
+                complexities = self.score_complexities(batch)
+                futures = [None] * len(batch)
+                for i in sorted(range(len(batch)), key=complexities.__getitem__, reverse=True):
+                    futures[i] = executor.submit(self.route_issue, batch[i], complexities[i], now)
                 
-            job = self.route_issue(issue)
-            self.save_job(job)
+                for future in previous:
+                    # Progress is throttled so large runs don't write thousands of lines
+                    if count % 100 == 0 and time.monotonic() >= next_progress:
+                        print(f"   Processed {count} issues...")
+                        next_progress = time.monotonic() + PROGRESS_INTERVAL
+                    self.save_job(future.result())
+                    count += 1
+                    
+                if not batch:
+                    break
+                previous = futures
             
-        self.stats['total_issues'] = len(issues)
-        print(f"✅ Completed processing {len(issues)} issues")
+        self.stats['total_issues'] = count
+        print(f"✅ Completed processing {count} issues")
 
     def generate_summary(self):
         """Generate orchestrator summary"""
@@ -513,22 +793,25 @@ class WedSyncOrchestrator:
             
         return summary
 
+    def _scan_queue_jobs(self):
+        """Record the job files already waiting in each queue's subdirectories"""
+        for queue_type, queued in self.queue_jobs.items():
+            queue_path = self.job_queues_path / queue_type
+            if not queue_path.exists():
+                continue
+            with os.scandir(queue_path) as subdirs:
+                for subdir in subdirs:
+                    if not subdir.is_dir():
+                        continue
+                    with os.scandir(subdir.path) as entries:
+                        queued.update(
+                            f"{subdir.name}/{entry.name}"
+                            for entry in entries if entry.name.endswith('.json')
+                        )
+
     def get_queue_status(self) -> Dict[str, int]:
         """Get count of jobs in each queue"""
-        status = {}
-        
-        for queue_type in ['SPEED-JOBS', 'DEEP-JOBS', 'SKIP-JOBS']:
-            queue_path = self.job_queues_path / queue_type
-            if queue_path.exists():
-                total = 0
-                for subdir in queue_path.iterdir():
-                    if subdir.is_dir():
-                        total += len(list(subdir.glob('*.json')))
-                status[queue_type] = total
-            else:
-                status[queue_type] = 0
-                
-        return status
+        return {queue_type: len(queued) for queue_type, queued in self.queue_jobs.items()}
 
     def get_recommendations(self) -> List[str]:
         """Generate recommendations based on job distribution"""
@@ -560,7 +843,8 @@ def main():
     
     orchestrator = WedSyncOrchestrator(args.base_path)
     
-    all_issues = []
+    # Each source is a lazy issue stream; nothing is read until processing starts
+    sources = []
     
     if args.process_everything:
         print(f"📥 Processing all available files in INCOMING/...")
@@ -572,90 +856,101 @@ def main():
                 continue
                 
             if "sonarqube" in file_path.name.lower():
-                print(f"   📊 Processing SonarQube: {file_path.name}")
-                issues = orchestrator.ingest_sonarqube(str(file_path))
-                print(f"      Found {len(issues)} SonarQube issues")
-                all_issues.extend(issues)
+                sources.append(announce(
+                    orchestrator.ingest_sonarqube(str(file_path)),
+                    f"   📊 Processing SonarQube: {file_path.name}",
+                    "      Found {} SonarQube issues"))
             elif "coderabbit" in file_path.name.lower():
-                print(f"   🐰 Processing CodeRabbit: {file_path.name}")
-                issues = orchestrator.ingest_coderabbit(str(file_path))
-                print(f"      Found {len(issues)} CodeRabbit issues")
-                all_issues.extend(issues)
+                sources.append(announce(
+                    orchestrator.ingest_coderabbit(str(file_path)),
+                    f"   🐰 Processing CodeRabbit: {file_path.name}",
+                    "      Found {} CodeRabbit issues"))
             elif "performance" in file_path.name.lower():
-                print(f"   ⚡ Processing Performance Audit: {file_path.name}")
-                issues = orchestrator.ingest_coderabbit(str(file_path))  # Same format as CodeRabbit
-                print(f"      Found {len(issues)} Performance issues")
-                all_issues.extend(issues)
+                sources.append(announce(
+                    orchestrator.ingest_coderabbit(str(file_path)),  # Same format as CodeRabbit
+                    f"   ⚡ Processing Performance Audit: {file_path.name}",
+                    "      Found {} Performance issues"))
             elif "synthetic" in file_path.name.lower():
-                print(f"   🧪 Processing Synthetic Test Data: {file_path.name}")
-                issues = orchestrator.ingest_sonarqube(str(file_path))  # Same format as SonarQube
-                print(f"      Found {len(issues)} Synthetic issues")
-                all_issues.extend(issues)
+                sources.append(announce(
+                    orchestrator.ingest_sonarqube(str(file_path)),  # Same format as SonarQube
+                    f"   🧪 Processing Synthetic Test Data: {file_path.name}",
+                    "      Found {} Synthetic issues"))
             elif "production" in file_path.name.lower():
-                print(f"   🏭 Processing Production Scale Data: {file_path.name}")
-                issues = orchestrator.ingest_sonarqube(str(file_path))  # Same format as SonarQube
-                print(f"      Found {len(issues)} Production issues")
-                all_issues.extend(issues)
+                sources.append(announce(
+                    orchestrator.ingest_sonarqube(str(file_path)),  # Same format as SonarQube
+                    f"   🏭 Processing Production Scale Data: {file_path.name}",
+                    "      Found {} Production issues"))
             elif "realistic" in file_path.name.lower():
-                print(f"   🎯 Processing Realistic Test Data: {file_path.name}")
-                issues = orchestrator.ingest_sonarqube(str(file_path))  # Same format as SonarQube
-                print(f"      Found {len(issues)} Realistic issues")
-                all_issues.extend(issues)
+                sources.append(announce(
+                    orchestrator.ingest_sonarqube(str(file_path)),  # Same format as SonarQube
+                    f"   🎯 Processing Realistic Test Data: {file_path.name}",
+                    "      Found {} Realistic issues"))
             else:
                 print(f"   ⚠️  Unknown format: {file_path.name} (skipping)")
                 
         for file_path in incoming_dir.glob("typescript*.txt"):
-            print(f"   📝 Processing TypeScript: {file_path.name}")
-            issues = orchestrator.ingest_typescript(str(file_path))
-            print(f"      Found {len(issues)} TypeScript issues")
-            all_issues.extend(issues)
+            sources.append(announce(
+                orchestrator.ingest_typescript(str(file_path)),
+                f"   📝 Processing TypeScript: {file_path.name}",
+                "      Found {} TypeScript issues"))
     
     if args.ingest_sonarqube:
-        print(f"📥 Ingesting SonarQube results from {args.ingest_sonarqube}")
-        issues = orchestrator.ingest_sonarqube(args.ingest_sonarqube)
-        print(f"   Found {len(issues)} SonarQube issues")
-        all_issues.extend(issues)
+        sources.append(announce(
+            orchestrator.ingest_sonarqube(args.ingest_sonarqube),
+            f"📥 Ingesting SonarQube results from {args.ingest_sonarqube}",
+            "   Found {} SonarQube issues"))
         
     if args.ingest_coderabbit:
-        print(f"📥 Ingesting CodeRabbit results from {args.ingest_coderabbit}")
-        issues = orchestrator.ingest_coderabbit(args.ingest_coderabbit)
-        print(f"   Found {len(issues)} CodeRabbit issues")
-        all_issues.extend(issues)
+        sources.append(announce(
+            orchestrator.ingest_coderabbit(args.ingest_coderabbit),
+            f"📥 Ingesting CodeRabbit results from {args.ingest_coderabbit}",
+            "   Found {} CodeRabbit issues"))
         
     if args.ingest_typescript:
-        print(f"📥 Ingesting TypeScript errors from {args.ingest_typescript}")
-        issues = orchestrator.ingest_typescript(args.ingest_typescript)
-        print(f"   Found {len(issues)} TypeScript issues")
-        all_issues.extend(issues)
+        sources.append(announce(
+            orchestrator.ingest_typescript(args.ingest_typescript),
+            f"📥 Ingesting TypeScript errors from {args.ingest_typescript}",
+            "   Found {} TypeScript issues"))
+    
+    all_issues = chain.from_iterable(sources)
+    if args.process_all or args.process_everything:
+        first_issue = next(all_issues, None)
+    else:
+        # Ingest-only run: read the sources anyway so their issue counts are reported
+        deque(all_issues, maxlen=0)
+        first_issue = None
         
-    if (args.process_all or args.process_everything) and all_issues:
-        orchestrator.process_issues(all_issues)
+    if first_issue is not None:
+        orchestrator.process_issues(chain((first_issue,), all_issues))
         summary = orchestrator.generate_summary()
         
-        print(f"\n📊 ORCHESTRATION COMPLETE")
-        print(f"════════════════════════")
-        print(f"Total Issues Processed: {summary['stats']['total_issues']}")
-        print(f"Speed Jobs Created: {summary['stats']['speed_jobs']}")
-        print(f"Deep Jobs Created: {summary['stats']['deep_jobs']}")
-        print(f"Skip Jobs (Already Resolved): {summary['stats']['skip_jobs']}")
-        print(f"\n💡 Recommendations:")
-        for rec in summary['recommendations']:
-            print(f"   • {rec}")
-            
-        print(f"\n🚀 Next Steps:")
-        print(f"   1. Start speed agents: cd JOB-QUEUES/SPEED-JOBS && ./claim-speed-job.sh")
-        print(f"   2. Start deep agents: cd JOB-QUEUES/DEEP-JOBS && ./claim-deep-job.sh")
-    elif args.process_everything and not all_issues:
+        # Build the report first and write it in one go
+        report = [
+            f"\n📊 ORCHESTRATION COMPLETE",
+            f"════════════════════════",
+            f"Total Issues Processed: {summary['stats']['total_issues']}",
+            f"Speed Jobs Created: {summary['stats']['speed_jobs']}",
+            f"Deep Jobs Created: {summary['stats']['deep_jobs']}",
+            f"Skip Jobs (Already Resolved): {summary['stats']['skip_jobs']}",
+            f"\n💡 Recommendations:"
+        ]
+        report.extend(f"   • {rec}" for rec in summary['recommendations'])
+        report.extend([
+            f"\n🚀 Next Steps:",
+            f"   1. Start speed agents: cd JOB-QUEUES/SPEED-JOBS && ./claim-speed-job.sh",
+            f"   2. Start deep agents: cd JOB-QUEUES/DEEP-JOBS && ./claim-deep-job.sh"
+        ])
+        print('\n'.join(report))
+    elif args.process_everything:
         print(f"   No issues found in INCOMING/ directory")
         
     elif args.status:
         summary = orchestrator.generate_summary()
         queue_status = summary['queue_status']
         
-        print(f"\n📊 ORCHESTRATOR STATUS")
-        print(f"═══════════════════════")
-        for queue, count in queue_status.items():
-            print(f"{queue}: {count} jobs")
+        report = [f"\n📊 ORCHESTRATOR STATUS", f"═══════════════════════"]
+        report.extend(f"{queue}: {count} jobs" for queue, count in queue_status.items())
+        print('\n'.join(report))
             
     else:
         parser.print_help()
@@ -4,8 +4,12 @@ Add Browser MCP references to testing sections in team prompts
 Enhances Playwright MCP sections with Browser MCP for interactive testing
 """
 
+from concurrent.futures import ProcessPoolExecutor
 import os
 import re
+import stat
+import sys
+import tempfile
 from pathlib import Path
 
 # Base directory
@@ -20,9 +24,12 @@ stats = {
     'total_files': 0,
     'updated_files': 0,
     'errors': 0,
-    'files_updated': []
+    'files_updated_sample': []  # first SAMPLE_SIZE updated paths, for the report
 }
 
+# How many updated files the report lists by name
+SAMPLE_SIZE = 10
+
 # Browser MCP testing addition
 BROWSER_MCP_SECTION = """
 ## 🌐 BROWSER MCP INTERACTIVE TESTING (NEW!)
@@ -79,68 +86,123 @@ await mcp__browsermcp__browser_tabs({action: "select", index: 0});
 
 """
 
-def add_browser_mcp_to_file(file_path: Path) -> bool:
-    """Add Browser MCP references to testing sections in a file."""
+BROWSER_MCP_BYTES = BROWSER_MCP_SECTION.encode('utf-8')
+BROWSER_MCP_INSERT = b"\n" + BROWSER_MCP_BYTES
+
+# Section and reference patterns, compiled once for all files. Files are
+# handled as raw bytes, so the patterns are bytes patterns too.
+PLAYWRIGHT_HEADER = '## 🎭 REVOLUTIONARY PLAYWRIGHT MCP TESTING'.encode('utf-8')
+PLAYWRIGHT_RE = re.compile(r'(## 🎭 REVOLUTIONARY PLAYWRIGHT MCP TESTING.*?)(?=##|\n---|\Z)'.encode('utf-8'), re.DOTALL)
+TESTING_RE = re.compile(rb'(## .*?(?:TEST|Testing).*?)(?=##|\n---|\Z)', re.DOTALL | re.IGNORECASE)
+TECH_STACK_RE = re.compile(rb'(- Testing: Playwright MCP)')
+AGENT_RE = re.compile(rb'(playwright-visual-testing-specialist[^\n]*)')
+
+def read_file(file_path: str):
+    """Read file_path through one raw fd; returns (data, permission bits).
+
+    The fstat that sizes the read also supplies the mode write_atomic
+    needs, so an updated file costs no further stat.
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        st = os.fstat(fd)
+        # One read of size + 1 reaches EOF unless the file grew since fstat
+        data = os.read(fd, st.st_size + 1)
+        if len(data) > st.st_size:
+            chunks = [data]
+            while chunk := os.read(fd, 65536):
+                chunks.append(chunk)
+            data = b''.join(chunks)
+        return data, stat.S_IMODE(st.st_mode)
+    finally:
+        os.close(fd)
+
+def write_atomic(file_path: str, data, mode: int):
+    """Replace file_path with data via a temp file and rename.
+
+    An interrupted run leaves either the old or the new file, never a
+    truncated one. The temp file is given the original permission bits.
+    """
+    dir_name = os.path.dirname(file_path)
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name, prefix='.browser-mcp-', suffix='.tmp')
+    try:
+        try:
+            os.fchmod(fd, mode)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def add_browser_mcp_to_file(file_path: str):
+    """Add Browser MCP references to testing sections in a file.
+
+    Returns (updated, error) where error is None or the exception raised.
+    Stats are tallied by the caller, so this can run in worker processes.
+    """
     try:
         # Read the file
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        original_content = content
+        content, mode = read_file(file_path)
         
         # Check if file already has Browser MCP references
-        if 'mcp__browsermcp__' in content or 'Browser MCP' in content:
-            return False  # Already has Browser MCP
+        if b'mcp__browsermcp__' in content or b'Browser MCP' in content:
+            return False, None  # Already has Browser MCP
+        
+        if b'\r' in content:
+            # Normalise CRLF/CR line endings, as text-mode reading used to
+            content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        original_content = content
         
         # Find the Playwright MCP testing section and add Browser MCP after it
-        playwright_section_pattern = r'(## 🎭 REVOLUTIONARY PLAYWRIGHT MCP TESTING.*?)(?=##|\n---|\Z)'
+        # (cheap substring checks first; a failed DOTALL search scans to the end
+        # of the file from every candidate header)
+        match = None
+        if PLAYWRIGHT_HEADER in content:
+            match = PLAYWRIGHT_RE.search(content)
         
-        match = re.search(playwright_section_pattern, content, re.DOTALL)
+        if not match:
+            # If no Playwright section found, look for testing section
+            # (upper() folds every case variant TESTING_RE can match onto 'TEST')
+            if b'## ' in content and b'TEST' in content.upper():
+                match = TESTING_RE.search(content)
         
         if match:
-            # Insert Browser MCP section after Playwright section
-            end_pos = match.end()
-            content = content[:end_pos] + "\n" + BROWSER_MCP_SECTION + content[end_pos:]
-        else:
-            # If no Playwright section found, look for testing section
-            testing_pattern = r'(## .*?(?:TEST|Testing).*?)(?=##|\n---|\Z)'
-            match = re.search(testing_pattern, content, re.DOTALL | re.IGNORECASE)
-            
-            if match:
-                end_pos = match.end()
-                content = content[:end_pos] + "\n" + BROWSER_MCP_SECTION + content[end_pos:]
+            # Insert Browser MCP section after the matched section, in place
+            # (one memmove rather than two slice copies and a concatenation)
+            content = bytearray(content)
+            content[match.end():match.end()] = BROWSER_MCP_INSERT
         
         # Also update technology stack to mention Browser MCP
-        if 'Technology Stack' in content:
-            content = re.sub(
-                r'(- Testing: Playwright MCP)',
-                r'\1, Browser MCP',
-                content
-            )
+        if b'Technology Stack' in content:
+            content = TECH_STACK_RE.sub(rb'\1, Browser MCP', content)
         
         # Update agent instructions to mention Browser MCP
-        if 'playwright-visual-testing-specialist' in content:
-            content = re.sub(
-                r'(playwright-visual-testing-specialist[^\n]*)',
-                r'\1 --use-browser-mcp',
-                content
-            )
+        if b'playwright-visual-testing-specialist' in content:
+            content = AGENT_RE.sub(rb'\1 --use-browser-mcp', content)
         
         # Check if content was modified
         if content != original_content:
-            # Write updated content
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write updated content in one write, then swap it into place
+            write_atomic(file_path, content, mode)
             
-            stats['files_updated'].append(str(file_path))
-            return True
+            return True, None
         
-        return False
+        return False, None
         
     except Exception as e:
-        print(f"      Error processing {file_path}: {e}")
-        stats['errors'] += 1
-        return False
+        return False, e
+
+def is_round_file(filename: str) -> bool:
+    """Only update round files (main implementation rounds)"""
+    # You can change this logic if you want to update all rounds
+    return 'round-1' in filename or 'round-2' in filename or 'round-3' in filename
 
 def process_teams():
     """Process all teams and batches."""
@@ -150,36 +212,74 @@ def process_teams():
     print("=" * 60)
     print()
     
+    # List every batch first so the round files can be processed in parallel
+    team_batches = {}
     for team in TEAMS:
-        print(f"Processing Team {team.upper()}...")
-        
+        team_batches[team] = []
         for batch in BATCHES:
-            batch_dir = Path(BASE_DIR) / f"team-{team}" / f"batch{batch}"
+            batch_dir = os.path.join(BASE_DIR, f"team-{team}", f"batch{batch}")
+            
+            # Opening the directory doubles as the existence check
+            try:
+                # Classify each file once while listing; the report below
+                # still needs the skipped ones
+                with os.scandir(batch_dir) as entries:
+                    md_files = [
+                        (entry, is_round_file(entry.name))
+                        for entry in entries if entry.name.endswith('.md') and entry.is_file()
+                    ]
+            except (FileNotFoundError, NotADirectoryError):
+                continue
             
-            if batch_dir.exists() and batch_dir.is_dir():
-                md_files = list(batch_dir.glob("*.md"))
+            if md_files:
+                team_batches[team].append((batch, md_files))
+    
+    round_files = [
+        entry.path
+        for batches in team_batches.values()
+        for _, md_files in batches
+        for entry, is_round in md_files if is_round
+    ]
+    
+    with ProcessPoolExecutor() as executor:
+        # Results come back in submission order, so the report reads as before
+        results = executor.map(add_browser_mcp_to_file, round_files, chunksize=16)
+        
+        for team in TEAMS:
+            print(f"Processing Team {team.upper()}...")
+            
+            for batch, md_files in team_batches[team]:
+                # Build the batch's report and write it in one go rather than
+                # two print() calls per file
+                lines = [f"  Batch {batch}: {len(md_files)} files"]
                 
-                if md_files:
-                    print(f"  Batch {batch}: {len(md_files)} files")
+                for entry, is_round in md_files:
+                    stats['total_files'] += 1
+                    filename = entry.name
                     
-                    for file_path in md_files:
-                        stats['total_files'] += 1
-                        filename = file_path.name
+                    if is_round:
+                        line = f"    Processing {filename}... "
                         
-                        # Only update round 1 files (main implementation rounds)
-                        # You can change this logic if you want to update all rounds
-                        if 'round-1' in filename or 'round-2' in filename or 'round-3' in filename:
-                            print(f"    Processing {filename}... ", end="")
-                            
-                            if add_browser_mcp_to_file(file_path):
-                                print("✓ Updated with Browser MCP")
-                                stats['updated_files'] += 1
-                            else:
-                                print("- Already has Browser MCP or no testing section")
+                        updated, error = next(results)
+                        if error is not None:
+                            line += f"      Error processing {entry.path}: {error}\n"
+                            stats['errors'] += 1
+                        
+                        if updated:
+                            line += "✓ Updated with Browser MCP"
+                            stats['updated_files'] += 1
+                            if len(stats['files_updated_sample']) < SAMPLE_SIZE:
+                                stats['files_updated_sample'].append(entry.path)
                         else:
-                            print(f"    Skipping {filename} (not a round file)")
-        
-        print()
+                            line += "- Already has Browser MCP or no testing section"
+                        lines.append(line)
+                    else:
+                        lines.append(f"    Skipping {filename} (not a round file)")
+                
+                lines.append("")
+                sys.stdout.write("\n".join(lines))
+            
+            print()
     
     # Print summary
     print("=" * 60)
@@ -208,16 +308,16 @@ def process_teams():
             print("⚠️  WARNING: No Browser MCP section found in sample file!")
     
     # List first few files that were updated
-    if stats['files_updated']:
+    if stats['files_updated_sample']:
         print()
         print("Files updated with Browser MCP:")
-        for file in stats['files_updated'][:10]:  # Show first 10
+        for file in stats['files_updated_sample']:
             print(f"  - {file}")
-        if len(stats['files_updated']) > 10:
-            print(f"  ... and {len(stats['files_updated']) - 10} more files")
+        if stats['updated_files'] > SAMPLE_SIZE:
+            print(f"  ... and {stats['updated_files'] - SAMPLE_SIZE} more files")
 
 if __name__ == "__main__":
     process_teams()
     print()
     print("Script complete. Browser MCP has been added to testing sections.")
-    print("Teams can now use both Playwright MCP and Browser MCP for comprehensive testing!")
\ No newline at end of file
+    print("Teams can now use both Playwright MCP and Browser MCP for comprehensive testing!")
@@ -6,15 +6,25 @@ This adds structured problem-solving capabilities for complex feature developmen
 """
 
 import os
-import glob
 import re
 from pathlib import Path
 
-def add_sequential_thinking_section(content):
-    """Add Sequential Thinking MCP section to team prompts."""
-    
-    # Sequential Thinking section to add
-    sequential_thinking_section = '''
+OUTBOX_DIR = 'WORKFLOW-V2-DRAFT/OUTBOX'
+
+# Batch directory name -> report group. Files are reported group by group
+# (batch17-19, batch20-29, batch30), the order the old glob patterns gave.
+BATCH_GROUPS = {f'batch{n}': 0 for n in range(17, 20)}
+BATCH_GROUPS.update({f'batch{n}': 1 for n in range(20, 30)})
+BATCH_GROUPS['batch30'] = 2
+
+SEQUENTIAL_THINKING_MARKER = b"SEQUENTIAL THINKING MCP FOR COMPLEX FEATURE ANALYSIS"
+
+# Insertion points, compiled once for all files
+INSERT_RE = re.compile(r'(---\s*\n\n)(## 📚 STEP 1: LOAD CURRENT DOCUMENTATION)', re.MULTILINE)
+FALLBACK_RE = re.compile(r'(---\s*\n\n)(.*?)(## 📚.*?LOAD.*?DOCUMENTATION)', re.MULTILINE | re.DOTALL)
+
+# Sequential Thinking section to add
+SEQUENTIAL_THINKING_SECTION = '''
 ## 🧠 SEQUENTIAL THINKING MCP FOR COMPLEX FEATURE ANALYSIS
 
 ### When to Use Sequential Thinking
@@ -95,83 +105,105 @@ mcp__sequential-thinking__sequential_thinking({
 ---
 '''
 
+# Replacement templates for the primary and fallback insertion points
+PRIMARY_REPL = r'\1' + SEQUENTIAL_THINKING_SECTION + r'\2'
+FALLBACK_REPL = r'\1\2' + SEQUENTIAL_THINKING_SECTION + r'\3'
+
+def add_sequential_thinking_section(content):
+    """Add Sequential Thinking MCP section to team prompts."""
+    
     # Find where to insert the Sequential Thinking section
     # Insert after technical requirements but before documentation loading
     
-    # Look for the pattern of technical requirements section ending
-    pattern = r'(---\s*\n\n)(## 📚 STEP 1: LOAD CURRENT DOCUMENTATION)'
+    # Look for the pattern of technical requirements section ending and
+    # insert the Sequential Thinking section before the documentation loading step
+    new_content, replaced = INSERT_RE.subn(PRIMARY_REPL, content, count=1)
+    if replaced:
+        return new_content
     
-    if re.search(pattern, content, re.MULTILINE):
-        # Insert the Sequential Thinking section before the documentation loading step
-        new_content = re.sub(
-            pattern,
-            r'\1' + sequential_thinking_section + r'\2',
-            content,
-            flags=re.MULTILINE
-        )
+    # Fallback: try to insert after any "---" section before documentation
+    new_content, replaced = FALLBACK_RE.subn(FALLBACK_REPL, content, count=1)
+    if replaced:
         return new_content
-    else:
-        # Fallback: try to insert after any "---" section before documentation
-        doc_pattern = r'(---\s*\n\n)(.*?)(## 📚.*?LOAD.*?DOCUMENTATION)'
-        if re.search(doc_pattern, content, re.MULTILINE | re.DOTALL):
-            new_content = re.sub(
-                doc_pattern,
-                r'\1\2' + sequential_thinking_section + r'\3',
-                content,
-                flags=re.MULTILINE | re.DOTALL
-            )
-            return new_content
     
     # If patterns don't match, return original content
     print(f"Warning: Could not find insertion point for Sequential Thinking section")
     return content
 
+def scan_dirs(path):
+    """List subdirectory entries of path, or nothing if it can't be read."""
+    try:
+        with os.scandir(path) as entries:
+            return [entry for entry in entries if entry.is_dir()]
+    except OSError:
+        return []
+
+def iter_team_files():
+    """Yield team prompt paths in batches 17-30 from one directory walk.
+
+    Matches what glob gave for 'team-*/batchNN/*.md': hidden files are
+    skipped and paths stay relative to the repository root.
+    """
+    groups = ([], [], [])
+    for team_dir in scan_dirs(OUTBOX_DIR):
+        if not team_dir.name.startswith('team-'):
+            continue
+        for batch_dir in scan_dirs(team_dir.path):
+            group = BATCH_GROUPS.get(batch_dir.name)
+            if group is None:
+                continue
+            try:
+                with os.scandir(batch_dir.path) as entries:
+                    groups[group].extend(
+                        entry.path for entry in entries
+                        if entry.name.endswith('.md') and not entry.name.startswith('.')
+                    )
+            except OSError:
+                continue
+    for paths in groups:
+        yield from paths
+
 def process_team_files():
     """Process all team prompt files in batches 17-30."""
     
-    # Get all team prompt files in batches 17-30
-    patterns = [
-        'WORKFLOW-V2-DRAFT/OUTBOX/team-*/batch1[7-9]/*.md',  # batch17, batch18, batch19
-        'WORKFLOW-V2-DRAFT/OUTBOX/team-*/batch2[0-9]/*.md',  # batch20-29
-        'WORKFLOW-V2-DRAFT/OUTBOX/team-*/batch30/*.md'       # batch30
-    ]
-    
     files_updated = 0
     files_failed = 0
     
-    for pattern in patterns:
-        files = glob.glob(pattern)
-        
-        for file_path in files:
-            try:
-                print(f"Processing: {file_path}")
-                
-                # Read file with UTF-8 encoding
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read()
-                
-                # Check if Sequential Thinking section already exists
-                if "SEQUENTIAL THINKING MCP FOR COMPLEX FEATURE ANALYSIS" in content:
-                    print(f"  Skipping - Sequential Thinking section already exists")
-                    continue
+    for file_path in iter_team_files():
+        try:
+            print(f"Processing: {file_path}")
+            
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            
+            # Check if Sequential Thinking section already exists (on the raw
+            # bytes, so already-processed files are never decoded)
+            if SEQUENTIAL_THINKING_MARKER in raw:
+                print(f"  Skipping - Sequential Thinking section already exists")
+                continue
+            
+            # Decode as UTF-8, with the newline handling text mode applied
+            content = raw.decode('utf-8', errors='replace')
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            
+            # Add Sequential Thinking section
+            updated_content = add_sequential_thinking_section(content)
+            
+            if updated_content != content:
+                # Write updated content back
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(updated_content)
                 
-                # Add Sequential Thinking section
-                updated_content = add_sequential_thinking_section(content)
-                
-                if updated_content != content:
-                    # Write updated content back
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(updated_content)
-                    
-                    print(f"  ✅ Updated with Sequential Thinking patterns")
-                    files_updated += 1
-                else:
-                    print(f"  ⚠️ No changes made - insertion point not found")
-                    files_failed += 1
-                    
-            except Exception as e:
-                print(f"  ❌ Error processing {file_path}: {e}")
+                print(f"  ✅ Updated with Sequential Thinking patterns")
+                files_updated += 1
+            else:
+                print(f"  ⚠️ No changes made - insertion point not found")
                 files_failed += 1
+                
+        except Exception as e:
+            print(f"  ❌ Error processing {file_path}: {e}")
+            files_failed += 1
     
     print(f"\n📊 Summary:")
     print(f"Files updated: {files_updated}")
@@ -185,4 +217,4 @@ if __name__ == "__main__":
     # Change to the correct directory
     os.chdir('/Users/skyphotography/CODE/WedSync-2.0/WedSync2')
     
-    process_team_files()
\ No newline at end of file
+    process_team_files()
@@ -3,6 +3,7 @@
 Final cleanup for remaining Context7 references
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import os
 import re
 
@@ -34,41 +35,58 @@ remaining_files = [
     "/Users/skyphotography/CODE/WedSync-2.0/WedSync2/WORKFLOW-V2-DRAFT/OUTBOX/team-e/batch28/WS-196-team-e-round-1.md"
 ]
 
+LIBRARY_LINE = '// Library ID resolution no longer needed with Ref MCP'
+
+# A run of consecutive lines that are identical once stripped and contain a
+# Ref call; the first line of the run is kept verbatim.
+DUP_REF_RE = re.compile(
+    r'^(?P<first>[^\S\n]*(?P<line>(?=\S)[^\n]*?await mcp__Ref__[^\n]*?(?<=\S))[^\S\n]*)'
+    r'(?:\n[^\S\n]*(?P=line)[^\S\n]*(?=\n|\Z))+',
+    re.MULTILINE
+)
+
+# Matches every case variant, so one pass covers Context7/context7/CONTEXT7
+CONTEXT7_RE = re.compile(r'context7', re.IGNORECASE)
+
+# Files are probed with non-ASCII bytes dropped and ASCII lower-cased, so a
+# token split by bytes the lenient decode would delete, or in any case,
+# still counts. No token in the probe means fix_file can't change the file.
+NON_ASCII = bytes(range(0x80, 0x100))
+FIX_TOKENS = (b'context7', b'mcp__ref__', LIBRARY_LINE.lower().encode('ascii'))
+
 def fix_file(filepath):
-    """Fix all Context7 references in a file."""
+    """Fix all Context7 references in a file.
+
+    Returns (fixed, error) where error is None or the exception raised, so
+    the caller can report files in order while they are fixed concurrently.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        
+        # Skip decoding and every regex pass when nothing could match
+        probe = raw.translate(None, NON_ASCII).lower()
+        if not any(token in probe for token in FIX_TOKENS):
+            return False, None
+        
+        content = raw.decode('utf-8', errors='ignore')
+        if '\r' in content:
+            # Match text-mode reading, which translates CRLF/CR line endings
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
         
         original = content
         
         # More aggressive replacements
         
         # Fix library ID resolution lines (may have been duplicated)
-        content = re.sub(
-            r'// Library ID resolution no longer needed with Ref MCP\n// Library ID resolution no longer needed with Ref MCP',
-            '// Library ID resolution no longer needed with Ref MCP',
-            content
-        )
+        content = content.replace(LIBRARY_LINE + '\n' + LIBRARY_LINE, LIBRARY_LINE)
         
         # Remove any lingering duplicate Ref calls
-        lines = content.split('\n')
-        cleaned_lines = []
-        prev_line = ""
-        
-        for line in lines:
-            # Skip duplicate consecutive lines
-            if line.strip() == prev_line.strip() and 'await mcp__Ref__' in line:
-                continue
-            cleaned_lines.append(line)
-            prev_line = line
-        
-        content = '\n'.join(cleaned_lines)
+        if 'await mcp__Ref__' in content:
+            content = DUP_REF_RE.sub(r'\g<first>', content)
         
         # Final Context7 cleanup - any remaining references
-        content = re.sub(r'Context7', 'Ref MCP', content, flags=re.IGNORECASE)
-        content = re.sub(r'context7', 'ref-mcp', content)
-        content = re.sub(r'CONTEXT7', 'Ref MCP', content)
+        content = CONTEXT7_RE.sub('Ref MCP', content)
         
         # Clean up any malformed Ref calls
         content = content.replace('mcp__Ref__ref_ref_', 'mcp__Ref__ref_')
@@ -76,11 +94,10 @@ def fix_file(filepath):
         if content != original:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
-            return True
-        return False
+            return True, None
+        return False, None
     except Exception as e:
-        print(f"Error processing {filepath}: {e}")
-        return False
+        return False, e
 
 print("=" * 60)
 print("FINAL MCP REFERENCE CLEANUP")
@@ -88,17 +105,25 @@ print("=" * 60)
 print()
 
 fixed_count = 0
-for filepath in remaining_files:
-    filename = os.path.basename(filepath)
-    print(f"Processing {filename}... ", end="")
+with ThreadPoolExecutor(max_workers=8) as executor:
+    # Results come back in submission order, so the report reads as before
+    results = executor.map(fix_file, remaining_files)
     
-    if fix_file(filepath):
-        print("✓ Fixed")
-        fixed_count += 1
-    else:
-        print("- No changes needed")
+    for filepath in remaining_files:
+        filename = os.path.basename(filepath)
+        print(f"Processing {filename}... ", end="")
+        
+        fixed, error = next(results)
+        if error is not None:
+            print(f"Error processing {filepath}: {error}")
+        
+        if fixed:
+            print("✓ Fixed")
+            fixed_count += 1
+        else:
+            print("- No changes needed")
 
 print()
 print("=" * 60)
 print(f"Cleanup complete! Fixed {fixed_count} files.")
-print("=" * 60)
\ No newline at end of file
+print("=" * 60)
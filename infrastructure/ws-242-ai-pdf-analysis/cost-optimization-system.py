@@ -5,22 +5,78 @@ Team E: Advanced AI Processing Cost Management and Optimization
 """
 
 import asyncio
+import itertools
 import json
+import os
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, NamedTuple
 from dataclasses import dataclass, asdict
 from enum import Enum
+from functools import lru_cache
 import logging
 import numpy as np
-import redis
+from redis import asyncio as aioredis
 from kubernetes import client, config
 import aiohttp
 from contextlib import asynccontextmanager
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib codec when orjson is not installed
+    orjson = None
+
+try:
+    import numba
+except ImportError:  # Fall back to plain NumPy when numba is not installed
+    numba = None
+
+# Batch queue payload codec. orjson runs in C, which keeps JSON work on the
+# event loop short for bulk enqueues and drains; redis-py sends its bytes as-is.
+if orjson is not None:
+    dump_payload = orjson.dumps
+    load_payload = orjson.loads
+else:
+    dump_payload = json.dumps
+    load_payload = json.loads
+
+# Bulk cost kernel: pages * $0.02 * (1 + complexity) per job. Numba fuses it
+# into one loop with no temporary arrays. Both versions use float64 in the same
+# operation order as _estimate_job_cost, so results match it exactly (no
+# fastmath, which could reassociate the products).
+if numba is not None:
+    @numba.njit(cache=True)
+    def _cost_kernel(pages, complexity):
+        out = np.empty_like(complexity)
+        for i in range(pages.size):
+            out[i] = pages[i] * 0.02 * (1.0 + complexity[i])
+        return out
+else:
+    def _cost_kernel(pages, complexity):
+        return pages * 0.02 * (1 + complexity)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Keys read by CostOptimizationEngine.track_costs_realtime, in MGET order
+COST_METRIC_KEYS = (
+    'cost:hourly',
+    'cost:daily',
+    'cost:monthly',
+    'jobs:daily_count',
+    'pages:daily_count',
+)
+
+# Job ids are a process-unique prefix plus a local sequence number: dense,
+# collision-free under bulk enqueue, and no clock read per job
+JOB_ID_PREFIX = f"job_{int(time.time())}_{os.getpid()}"
+_job_sequence = itertools.count(1)
+
+def next_job_ids(count: int) -> List[str]:
+    """Reserve count consecutive job ids"""
+    return [f"{JOB_ID_PREFIX}_{next(_job_sequence)}" for _ in range(count)]
+
 class ProcessingPriority(Enum):
     URGENT = "urgent"           # Wedding day emergencies - process immediately
     STANDARD = "standard"       # Regular business hours - 5min batching
@@ -33,6 +89,43 @@ class DocumentType(Enum):
     CLIENT_FORM = "client_form"
     BULK_IMPORT = "bulk_import"
 
+# Document type lookups shared by the cost tracker and the batch processor
+DOCUMENT_TYPES_BY_VALUE = {doc_type.value: doc_type for doc_type in DocumentType}
+
+DOCUMENT_COMPLEXITY_SCORES = {
+    DocumentType.WEDDING_CONTRACT: 0.9,    # High complexity
+    DocumentType.VENDOR_AGREEMENT: 0.7,   # Medium complexity
+    DocumentType.PRICING_SHEET: 0.5,      # Lower complexity
+    DocumentType.CLIENT_FORM: 0.3,        # Simple forms
+    DocumentType.BULK_IMPORT: 0.4,        # Variable complexity
+}
+
+@lru_cache(maxsize=64)
+def _doc_type_complexity(value: str) -> float:
+    """Complexity score for a raw document_type value (ValueError if unknown)"""
+    return DOCUMENT_COMPLEXITY_SCORES.get(DocumentType(value), 0.5)
+
+@lru_cache(maxsize=64)
+def _doc_type_model(doc_type: str) -> str:
+    """Optimal AI model for a raw document_type value"""
+    doc_enum = DOCUMENT_TYPES_BY_VALUE.get(doc_type, DocumentType.CLIENT_FORM)
+    complexity = DOCUMENT_COMPLEXITY_SCORES[doc_enum]
+    
+    # Select model based on complexity
+    if complexity > 0.8:  # High complexity documents
+        return "wedding-contract-v1" if doc_type == 'wedding_contract' else "gpt-4-1106-preview"
+    elif complexity > 0.5:  # Medium complexity
+        return "vendor-agreement-v1" if doc_type == 'vendor_agreement' else "gpt-3.5-turbo-instruct"
+    else:  # Simple documents
+        return "gpt-3.5-turbo"
+
+# Wedding season cost multipliers, indexed by month (index 0 is unused)
+SEASONAL_MULTIPLIERS = (
+    1.0,
+    0.6, 0.7, 0.9, 2.5, 3.2, 3.8,
+    3.5, 3.0, 2.8, 2.2, 0.8, 0.5
+)
+
 @dataclass
 class UsagePatterns:
     """AI usage pattern analysis"""
@@ -102,19 +195,84 @@ class AIModelCostTracker:
             "vendor-agreement-v1": 0.91,
         }
         
-        self.document_complexity_scores = {
-            DocumentType.WEDDING_CONTRACT: 0.9,    # High complexity
-            DocumentType.VENDOR_AGREEMENT: 0.7,   # Medium complexity
-            DocumentType.PRICING_SHEET: 0.5,      # Lower complexity
-            DocumentType.CLIENT_FORM: 0.3,        # Simple forms
-            DocumentType.BULK_IMPORT: 0.4,        # Variable complexity
-        }
+        self.document_complexity_scores = DOCUMENT_COMPLEXITY_SCORES
+
+# Moves up to a limit of the jobs queued before a cutoff from one priority tier
+# to the next, with their enqueue-time index and payload entries, in a single
+# server-side step. Aged payloads are looked up by job id, so the cost is
+# proportional to the jobs moved, not to the length of the queue.
+# KEYS: source queue, source enqueued index, source payloads,
+#       target queue, target enqueued index, target payloads
+# ARGV: cutoff enqueue time (epoch ms), max jobs to move
+PROMOTE_AGED_JOBS_SCRIPT = """
+local aged = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2])
+local moved = 0
+for i = 1, #aged, 2 do
+    local job_id = aged[i]
+    local payload = redis.call('HGET', KEYS[3], job_id)
+    redis.call('ZREM', KEYS[2], job_id)
+    if payload then
+        local cost = redis.call('ZSCORE', KEYS[1], payload)
+        redis.call('HDEL', KEYS[3], job_id)
+        if cost then
+            redis.call('ZREM', KEYS[1], payload)
+            redis.call('ZADD', KEYS[4], cost, payload)
+            redis.call('ZADD', KEYS[5], aged[i + 1], job_id)
+            redis.call('HSET', KEYS[6], job_id, payload)
+            moved = moved + 1
+        end
+    end
+end
+return moved
+"""
+
+# Pops the next batch from a priority queue, or reports that it should keep
+# waiting for a fuller batch. Returns {'empty'}, {'wait'} or {'batch', payloads...};
+# ZPOPMIN takes the cheapest jobs first.
+# KEYS: queue, enqueued index, payloads
+# ARGV: max batch size, max wait (ms), now (epoch ms), 1 if the tier may wait
+DRAIN_OR_WAIT_SCRIPT = """
+local queued = redis.call('ZCARD', KEYS[1])
+if queued == 0 then
+    return {'empty'}
+end
+local max_batch = tonumber(ARGV[1])
+local batch_size = math.min(max_batch, queued)
+if batch_size < max_batch and ARGV[4] == '1' then
+    local oldest = redis.call('ZRANGE', KEYS[2], 0, 0, 'WITHSCORES')
+    if #oldest > 0 and tonumber(ARGV[3]) - tonumber(oldest[2]) < tonumber(ARGV[2]) then
+        return {'wait'}
+    end
+end
+local popped = redis.call('ZPOPMIN', KEYS[1], batch_size)
+local result = {'batch'}
+for i = 1, #popped, 2 do
+    result[#result + 1] = popped[i]
+    local job_id = cjson.decode(popped[i])['job_id']
+    redis.call('ZREM', KEYS[2], job_id)
+    redis.call('HDEL', KEYS[3], job_id)
+end
+return result
+"""
+
+# In-process enqueue buffer: single jobs are parked here and written to Redis
+# by one flusher task, up to ENQUEUE_FLUSH_MAX jobs per round trip
+ENQUEUE_BUFFER_SIZE = 10000
+ENQUEUE_FLUSH_MAX = 500
+
+# Most aged jobs promoted per tier per tick, bounding each promotion script run
+PROMOTE_MAX_JOBS = 1000
 
 class IntelligentBatchProcessor:
     """Intelligent batching system for cost optimization"""
     
     def __init__(self, redis_client):
         self.redis_client = redis_client
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._promote_aged_jobs = redis_client.register_script(PROMOTE_AGED_JOBS_SCRIPT)
+        self._drain_or_wait = redis_client.register_script(DRAIN_OR_WAIT_SCRIPT)
+        self._enqueue_q: asyncio.Queue = asyncio.Queue(maxsize=ENQUEUE_BUFFER_SIZE)
+        self._flusher: Optional[asyncio.Task] = None
         self.batch_queues = {
             ProcessingPriority.URGENT: "batch:urgent",
             ProcessingPriority.STANDARD: "batch:standard", 
@@ -134,72 +292,219 @@ class IntelligentBatchProcessor:
             ProcessingPriority.LOW_PRIORITY: {
                 'max_batch_size': 25,     # Large batches
                 'max_wait_seconds': 1800, # 30 minutes
-                'cost_multiplier': 0.5    # 50% cost reduction
+                'cost_multiplier': 0.5,   # 50% cost reduction
+                'aging_seconds': 3600     # Promote to standard after 1 hour
             }
         }
+        # Aging promotions. Nothing is promoted into URGENT: it drains one job
+        # per tick and is reserved for genuinely urgent (wedding-day) work.
+        self.promotions = [
+            (ProcessingPriority.LOW_PRIORITY, ProcessingPriority.STANDARD)
+        ]
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, so batch POSTs reuse pooled keep-alive connections"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Flush buffered jobs, stop the flusher and close the shared HTTP session"""
+        if self._flusher is not None:
+            if not self._flusher.done():
+                await self._enqueue_q.join()
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
     
     async def add_to_batch_queue(self, job_data: Dict, priority: ProcessingPriority) -> str:
         """Add job to appropriate batch queue"""
         queue_name = self.batch_queues[priority]
-        job_id = f"job_{datetime.now().timestamp()}"
+        job_id, = next_job_ids(1)
+        added_at_ns = time.time_ns()
         
         job_payload = {
             'job_id': job_id,
             'job_data': job_data,
-            'added_at': datetime.now().isoformat(),
+            'added_at_ns': added_at_ns,
             'priority': priority.value,
             'estimated_cost': await self._estimate_job_cost(job_data)
         }
         
-        await self.redis_client.lpush(queue_name, json.dumps(job_payload))
-        logger.info(f"Added job {job_id} to {priority.value} batch queue")
+        # The flusher writes the job together with whatever else arrived
+        # meanwhile; waiting on its future keeps a failed write the caller's
+        # error. put() only waits when the buffer is full.
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._enqueue_flusher())
+        written = asyncio.get_running_loop().create_future()
+        await self._enqueue_q.put((queue_name, job_id, dump_payload(job_payload),
+                                   job_payload['estimated_cost'], added_at_ns // 1_000_000, written))
+        await written
+        logger.debug("Added job %s to %s batch queue", job_id, priority.value)
         
         return job_id
     
+    async def add_many_to_batch_queue(self, jobs: List[Dict], priority: ProcessingPriority) -> List[str]:
+        """Add many jobs (e.g. a bulk import) to a batch queue in one round trip"""
+        if not jobs:
+            return []
+        
+        queue_name = self.batch_queues[priority]
+        added_at_ns = time.time_ns()
+        estimated_costs = self._estimate_batch_costs(jobs).tolist()
+        
+        job_ids = next_job_ids(len(jobs))
+        payloads = [
+            dump_payload({
+                'job_id': job_id,
+                'job_data': job_data,
+                'added_at_ns': added_at_ns,
+                'priority': priority.value,
+                'estimated_cost': estimated_cost
+            })
+            for job_id, job_data, estimated_cost in zip(job_ids, jobs, estimated_costs)
+        ]
+        
+        await self._push_jobs(queue_name, added_at_ns // 1_000_000, job_ids, payloads, estimated_costs)
+        logger.info("Added %d jobs to %s batch queue", len(job_ids), priority.value)
+        
+        return job_ids
+    
+    async def _enqueue_flusher(self) -> None:
+        """Write buffered jobs to Redis, everything queued so far per round trip"""
+        while True:
+            items = [await self._enqueue_q.get()]
+            while len(items) < ENQUEUE_FLUSH_MAX:
+                try:
+                    items.append(self._enqueue_q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                await self._flush_buffered_jobs(items)
+            except Exception as e:
+                # The transaction wrote nothing; each waiting caller gets the error
+                logger.error("Failed to flush %d buffered jobs to Redis: %s", len(items), e)
+                for *_, written in items:
+                    if not written.done():
+                        written.set_exception(e)
+            else:
+                for *_, written in items:
+                    if not written.done():
+                        written.set_result(None)
+            finally:
+                for *_, written in items:
+                    # Only left pending if the flusher itself was cancelled
+                    if not written.done():
+                        written.cancel()
+                    self._enqueue_q.task_done()
+    
+    async def _flush_buffered_jobs(self, items: List[tuple]) -> None:
+        """Queue buffered (queue, job id, payload, cost, enqueue ms, future) jobs in one MULTI/EXEC"""
+        by_queue: Dict[str, tuple] = {}
+        for queue_name, job_id, payload, estimated_cost, added_at_ms, _ in items:
+            enqueued, queued, payloads = by_queue.setdefault(queue_name, ({}, {}, {}))
+            enqueued[job_id] = added_at_ms
+            queued[payload] = estimated_cost
+            payloads[job_id] = payload
+        
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            for queue_name, (enqueued, queued, payloads) in by_queue.items():
+                pipe.zadd(self._enqueued_key(queue_name), enqueued)
+                pipe.zadd(queue_name, queued)
+                pipe.hset(self._payloads_key(queue_name), mapping=payloads)
+            await pipe.execute()
+        logger.debug("Flushed %d buffered jobs to Redis", len(items))
+    
+    @staticmethod
+    def _enqueued_key(queue_name: str) -> str:
+        """Sorted set of the queue's job ids scored by enqueue time (epoch ms)"""
+        return f"{queue_name}:enqueued"
+    
+    @staticmethod
+    def _payloads_key(queue_name: str) -> str:
+        """Hash of the queue's job ids to their queued payloads"""
+        return f"{queue_name}:payloads"
+    
+    async def _push_jobs(self, queue_name: str, added_at_ms: int, job_ids: List[str],
+                         payloads: List, estimated_costs: List[float]) -> None:
+        """Queue payloads scored by estimated cost and record their enqueue time
+        
+        Each priority queue is a sorted set, so draining it with ZPOPMIN takes
+        the cheapest (shortest) jobs first within the tier.
+        """
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.zadd(self._enqueued_key(queue_name), dict.fromkeys(job_ids, added_at_ms))
+            pipe.zadd(queue_name, dict(zip(payloads, estimated_costs)))
+            pipe.hset(self._payloads_key(queue_name), mapping=dict(zip(job_ids, payloads)))
+            await pipe.execute()
+    
     async def process_batch_queues(self) -> Dict[ProcessingPriority, int]:
         """Process all batch queues based on their configurations"""
-        processed_counts = {}
+        await self._age_queues()
         
-        for priority, queue_name in self.batch_queues.items():
-            config = self.batch_configs[priority]
-            processed = await self._process_priority_queue(priority, queue_name, config)
-            processed_counts[priority] = processed
+        # The queues use independent keys, so scan them concurrently
+        priorities = list(self.batch_queues)
+        processed = await asyncio.gather(*(
+            self._process_priority_queue(priority, self.batch_queues[priority], self.batch_configs[priority])
+            for priority in priorities
+        ))
         
-        return processed_counts
+        return dict(zip(priorities, processed))
+    
+    async def _age_queues(self) -> None:
+        """Promote jobs that have waited past their tier's aging threshold
+        
+        Keeps sustained standard volume from starving low priority jobs.
+        Promoted jobs keep their original enqueue time, so the next tier
+        flushes them without a fresh wait.
+        """
+        now_ms = time.time_ns() // 1_000_000
+        for source, target in self.promotions:
+            source_queue = self.batch_queues[source]
+            target_queue = self.batch_queues[target]
+            cutoff_ms = now_ms - self.batch_configs[source]['aging_seconds'] * 1000
+            
+            moved = await self._promote_aged_jobs(
+                keys=[source_queue, self._enqueued_key(source_queue), self._payloads_key(source_queue),
+                      target_queue, self._enqueued_key(target_queue), self._payloads_key(target_queue)],
+                args=[cutoff_ms, PROMOTE_MAX_JOBS]
+            )
+            if moved:
+                logger.info("Promoted %d aged jobs from %s to %s queue", moved, source.value, target.value)
     
     async def _process_priority_queue(self, priority: ProcessingPriority, 
                                     queue_name: str, config: Dict) -> int:
         """Process a specific priority queue"""
-        queue_length = await self.redis_client.llen(queue_name)
+        # Decide and drain in one atomic server-side step: no round trip between
+        # checking the queue and popping it, and no race with other workers
+        state, *popped = await self._drain_or_wait(
+            keys=[queue_name, self._enqueued_key(queue_name), self._payloads_key(queue_name)],
+            args=[
+                config['max_batch_size'],
+                config['max_wait_seconds'] * 1000,
+                time.time_ns() // 1_000_000,
+                0 if priority == ProcessingPriority.URGENT else 1
+            ]
+        )
         
-        if queue_length == 0:
+        if state == 'wait':
+            logger.info("Waiting for more jobs in %s queue", priority.value)
             return 0
         
-        # Determine batch size
-        batch_size = min(config['max_batch_size'], queue_length)
-        
-        # Check if we should wait for more jobs
-        if batch_size < config['max_batch_size'] and priority != ProcessingPriority.URGENT:
-            oldest_job_data = await self.redis_client.lindex(queue_name, -1)
-            if oldest_job_data:
-                oldest_job = json.loads(oldest_job_data)
-                added_at = datetime.fromisoformat(oldest_job['added_at'])
-                wait_time = (datetime.now() - added_at).total_seconds()
-                
-                if wait_time < config['max_wait_seconds']:
-                    logger.info(f"Waiting for more jobs in {priority.value} queue")
-                    return 0
-        
-        # Process the batch
-        batch_jobs = []
-        for _ in range(batch_size):
-            job_data = await self.redis_client.rpop(queue_name)
-            if job_data:
-                batch_jobs.append(json.loads(job_data))
+        batch_jobs = [load_payload(job_data) for job_data in popped]
         
         if batch_jobs:
             await self._process_job_batch(batch_jobs, priority, config)
-            logger.info(f"Processed batch of {len(batch_jobs)} jobs from {priority.value} queue")
+            logger.info("Processed batch of %d jobs from %s queue", len(batch_jobs), priority.value)
         
         return len(batch_jobs)
     
@@ -209,9 +514,8 @@ class IntelligentBatchProcessor:
         total_estimated_cost = sum(job['estimated_cost'] for job in batch_jobs)
         optimized_cost = total_estimated_cost * config['cost_multiplier']
         
-        logger.info(f"Processing batch: {len(batch_jobs)} jobs, "
-                   f"estimated cost: ${total_estimated_cost:.2f}, "
-                   f"optimized cost: ${optimized_cost:.2f}")
+        logger.info("Processing batch: %d jobs, estimated cost: $%.2f, optimized cost: $%.2f",
+                    len(batch_jobs), total_estimated_cost, optimized_cost)
         
         # Group jobs by document type for model optimization
         jobs_by_type = {}
@@ -241,20 +545,19 @@ class IntelligentBatchProcessor:
         }
         
         # Send to AI processing service
-        async with aiohttp.ClientSession() as session:
-            async with session.post('http://ai-processor:8080/process-batch', 
-                                  json=batch_request) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    logger.info(f"Batch processed successfully: {result}")
-                else:
-                    logger.error(f"Batch processing failed: {response.status}")
+        async with self._get_session().post('http://ai-processor:8080/process-batch', 
+                                             json=batch_request) as response:
+            if response.status == 200:
+                result = await response.json()
+                # Per document type detail; the batch summary is logged by the caller
+                logger.debug("Batch processed successfully: %s", result)
+            else:
+                logger.error("Batch processing failed: %s", response.status)
     
     async def _estimate_job_cost(self, job_data: Dict) -> float:
         """Estimate cost for a single job"""
-        doc_type = DocumentType(job_data.get('document_type', 'client_form'))
         page_count = job_data.get('page_count', 1)
-        complexity_score = AIModelCostTracker().document_complexity_scores.get(doc_type, 0.5)
+        complexity_score = _doc_type_complexity(job_data.get('document_type', 'client_form'))
         
         # Base cost calculation
         base_cost_per_page = 0.02
@@ -263,29 +566,27 @@ class IntelligentBatchProcessor:
         
         return estimated_cost
     
+    def _estimate_batch_costs(self, jobs_data: List[Dict]) -> np.ndarray:
+        """Estimate costs for many jobs in one vectorized pass
+        
+        Same formula and float64 arithmetic as _estimate_job_cost, so each
+        element equals the per-job estimate.
+        """
+        count = len(jobs_data)
+        pages = np.fromiter(
+            (job_data.get('page_count', 1) for job_data in jobs_data),
+            dtype=np.float64, count=count
+        )
+        complexity = np.fromiter(
+            (_doc_type_complexity(job_data.get('document_type', 'client_form')) for job_data in jobs_data),
+            dtype=np.float64, count=count
+        )
+        
+        return _cost_kernel(pages, complexity)
+    
     async def _select_optimal_model(self, doc_type: str, batch_size: int) -> str:
         """Select optimal AI model based on document type and batch size"""
-        model_tracker = AIModelCostTracker()
-        
-        # Map document type to optimal model
-        type_to_enum = {
-            'wedding_contract': DocumentType.WEDDING_CONTRACT,
-            'vendor_agreement': DocumentType.VENDOR_AGREEMENT,
-            'pricing_sheet': DocumentType.PRICING_SHEET,
-            'client_form': DocumentType.CLIENT_FORM,
-            'bulk_import': DocumentType.BULK_IMPORT
-        }
-        
-        doc_enum = type_to_enum.get(doc_type, DocumentType.CLIENT_FORM)
-        complexity = model_tracker.document_complexity_scores[doc_enum]
-        
-        # Select model based on complexity and batch size
-        if complexity > 0.8:  # High complexity documents
-            return "wedding-contract-v1" if doc_type == 'wedding_contract' else "gpt-4-1106-preview"
-        elif complexity > 0.5:  # Medium complexity
-            return "vendor-agreement-v1" if doc_type == 'vendor_agreement' else "gpt-3.5-turbo-instruct"
-        else:  # Simple documents
-            return "gpt-3.5-turbo"
+        return _doc_type_model(doc_type)
 
 class CostOptimizationEngine:
     """Main cost optimization engine for AI PDF processing"""
@@ -306,11 +607,13 @@ class CostOptimizationEngine:
     async def initialize(self):
         """Initialize the cost optimization engine"""
         try:
-            # Initialize Redis connection
-            self.redis_client = redis.asyncio.Redis(
+            # Initialize Redis connection (asyncio client only, shared with the
+            # batch processor, so no call path can block the event loop)
+            self.redis_client = aioredis.Redis(
                 host='redis-pdf-queue',
                 port=6379,
-                decode_responses=True
+                decode_responses=True,
+                max_connections=32
             )
             
             self.batch_processor = IntelligentBatchProcessor(self.redis_client)
@@ -320,6 +623,13 @@ class CostOptimizationEngine:
             logger.error(f"Failed to initialize cost optimization engine: {str(e)}")
             raise
     
+    async def close(self):
+        """Release the batch processor's HTTP session and the Redis pool"""
+        if self.batch_processor is not None:
+            await self.batch_processor.aclose()
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+    
     async def optimize_ai_processing_costs(self) -> AIProcessingOptimization:
         """Main cost optimization workflow"""
         logger.info("Starting AI processing cost optimization")
@@ -332,27 +642,32 @@ class CostOptimizationEngine:
             optimizations = []
             results = []
             
-            # 1. Batch processing optimization
-            if usage_patterns.can_benefit_from_batching:
-                batch_optimization = await self._optimize_batch_processing(usage_patterns)
-                optimizations.append(batch_optimization)
+            # Config writes are queued on one MULTI/EXEC pipeline: a single
+            # round trip, and readers never see a half-applied configuration
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                # 1. Batch processing optimization
+                if usage_patterns.can_benefit_from_batching:
+                    batch_optimization = await self._optimize_batch_processing(usage_patterns)
+                    optimizations.append(batch_optimization)
+                    
+                    batch_result = await self._apply_batch_optimization(batch_optimization, pipe)
+                    results.append(batch_result)
                 
-                batch_result = await self._apply_batch_optimization(batch_optimization)
-                results.append(batch_result)
-            
-            # 2. Model selection optimization
-            model_optimization = await self._optimize_model_selection(usage_patterns)
-            optimizations.append(model_optimization)
-            
-            model_result = await self._apply_model_optimization(model_optimization)
-            results.append(model_result)
-            
-            # 3. Preprocessing optimization
-            preprocessing_optimization = await self._optimize_preprocessing(usage_patterns)
-            optimizations.append(preprocessing_optimization)
-            
-            preprocess_result = await self._apply_preprocessing_optimization(preprocessing_optimization)
-            results.append(preprocess_result)
+                # 2. Model selection optimization
+                model_optimization = await self._optimize_model_selection(usage_patterns)
+                optimizations.append(model_optimization)
+                
+                model_result = await self._apply_model_optimization(model_optimization, pipe)
+                results.append(model_result)
+                
+                # 3. Preprocessing optimization
+                preprocessing_optimization = await self._optimize_preprocessing(usage_patterns)
+                optimizations.append(preprocessing_optimization)
+                
+                preprocess_result = await self._apply_preprocessing_optimization(preprocessing_optimization, pipe)
+                results.append(preprocess_result)
+                
+                await pipe.execute()
             
             # Calculate total savings
             total_monthly_savings = sum(r.get('monthly_savings', 0) for r in results)
@@ -376,8 +691,7 @@ class CostOptimizationEngine:
         # In a real implementation, this would query historical data
         # For now, return simulated usage patterns
         
-        current_date = datetime.now()
-        seasonal_multiplier = self._calculate_seasonal_multiplier(current_date)
+        seasonal_multiplier = SEASONAL_MULTIPLIERS[datetime.now().month]
         
         return UsagePatterns(
             daily_job_volume=500,
@@ -394,18 +708,6 @@ class CostOptimizationEngine:
             seasonal_multiplier=seasonal_multiplier
         )
     
-    def _calculate_seasonal_multiplier(self, date: datetime) -> float:
-        """Calculate seasonal cost multiplier based on wedding season"""
-        month = date.month
-        
-        # Wedding season multipliers
-        seasonal_patterns = {
-            1: 0.6, 2: 0.7, 3: 0.9, 4: 2.5, 5: 3.2, 6: 3.8,
-            7: 3.5, 8: 3.0, 9: 2.8, 10: 2.2, 11: 0.8, 12: 0.5
-        }
-        
-        return seasonal_patterns.get(month, 1.0)
-    
     async def _optimize_batch_processing(self, patterns: UsagePatterns) -> BatchOptimizationConfig:
         """Optimize batch processing configuration"""
         
@@ -479,13 +781,13 @@ class CostOptimizationEngine:
             'total_expected_savings': 0.25  # Average 25% savings
         }
     
-    async def _apply_batch_optimization(self, config: BatchOptimizationConfig) -> Dict:
-        """Apply batch processing optimization"""
+    async def _apply_batch_optimization(self, config: BatchOptimizationConfig, pipe) -> Dict:
+        """Apply batch processing optimization (writes are queued on pipe)"""
         logger.info(f"Applying batch optimization: batch_size={config.batch_size}")
         
         # Update batch processor configuration
         for priority, threshold in config.priority_thresholds.items():
-            await self.redis_client.set(f"batch_threshold:{priority.value}", threshold)
+            pipe.set(f"batch_threshold:{priority.value}", threshold)
         
         # Calculate monthly savings
         daily_jobs = 500  # From usage patterns
@@ -501,8 +803,8 @@ class CostOptimizationEngine:
             'expected_performance_impact': 'minimal'
         }
     
-    async def _apply_model_optimization(self, config: ModelOptimizationConfig) -> Dict:
-        """Apply model selection optimization"""
+    async def _apply_model_optimization(self, config: ModelOptimizationConfig, pipe) -> Dict:
+        """Apply model selection optimization (writes are queued on pipe)"""
         logger.info("Applying model selection optimization")
         
         # Store optimal model configuration
@@ -512,7 +814,7 @@ class CostOptimizationEngine:
             'updated_at': datetime.now().isoformat()
         }
         
-        await self.redis_client.set('optimal_model_config', json.dumps(model_config))
+        pipe.set('optimal_model_config', json.dumps(model_config))
         
         # Estimate savings based on model cost differences
         estimated_monthly_savings = 450.0  # Based on model cost analysis
@@ -524,12 +826,12 @@ class CostOptimizationEngine:
             'accuracy_impact': 'maintained or improved'
         }
     
-    async def _apply_preprocessing_optimization(self, config: Dict) -> Dict:
-        """Apply preprocessing optimization"""
+    async def _apply_preprocessing_optimization(self, config: Dict, pipe) -> Dict:
+        """Apply preprocessing optimization (writes are queued on pipe)"""
         logger.info("Applying preprocessing optimization")
         
         # Store preprocessing configuration
-        await self.redis_client.set('preprocessing_config', json.dumps(config))
+        pipe.set('preprocessing_config', json.dumps(config))
         
         # Calculate savings
         monthly_savings = 200.0 * config['total_expected_savings']
@@ -544,14 +846,15 @@ class CostOptimizationEngine:
     async def track_costs_realtime(self) -> CostTrackingMetrics:
         """Track and report real-time cost metrics"""
         try:
-            # Get current cost data from Redis
-            hourly_cost = float(await self.redis_client.get('cost:hourly') or 0)
-            daily_cost = float(await self.redis_client.get('cost:daily') or 0)
-            monthly_cost = float(await self.redis_client.get('cost:monthly') or 0)
+            # Get current cost data from Redis in one round trip
+            hourly, daily, monthly, jobs, pages = await self.redis_client.mget(COST_METRIC_KEYS)
+            hourly_cost = float(hourly or 0)
+            daily_cost = float(daily or 0)
+            monthly_cost = float(monthly or 0)
             
             # Calculate derived metrics
-            jobs_today = int(await self.redis_client.get('jobs:daily_count') or 1)
-            pages_today = int(await self.redis_client.get('pages:daily_count') or 1)
+            jobs_today = int(jobs or 1)
+            pages_today = int(pages or 1)
             
             cost_per_job = daily_cost / jobs_today if jobs_today > 0 else 0
             cost_per_page = daily_cost / pages_today if pages_today > 0 else 0
@@ -579,6 +882,12 @@ class CostOptimizationEngine:
         """Main cost optimization loop"""
         logger.info("Starting cost optimization loop")
         
+        # Minute batching and hourly optimization run as separate tasks, so the
+        # hourly run wakes exactly on the hour instead of polling every minute
+        await asyncio.gather(self._batch_tick_loop(), self._hourly_optimize_loop())
+    
+    async def _batch_tick_loop(self):
+        """Process batch queues and update cost tracking every minute"""
         while True:
             try:
                 # Run batch processing
@@ -591,26 +900,32 @@ class CostOptimizationEngine:
                 # Update cost tracking
                 await self.track_costs_realtime()
                 
-                # Run full optimization every hour
-                current_minute = datetime.now().minute
-                if current_minute == 0:  # Top of the hour
-                    await self.optimize_ai_processing_costs()
-                
-                # Wait before next iteration
-                await asyncio.sleep(60)  # 1 minute intervals
-                
             except Exception as e:
                 logger.error(f"Error in cost optimization loop: {str(e)}")
-                await asyncio.sleep(60)
+            
+            # Wait before next iteration
+            await asyncio.sleep(60)  # 1 minute intervals
+    
+    async def _hourly_optimize_loop(self):
+        """Run full optimization at the top of every (local) hour"""
+        while True:
+            now = datetime.now()
+            next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            await asyncio.sleep((next_hour - now).total_seconds())
+            
+            try:
+                await self.optimize_ai_processing_costs()
+            except Exception as e:
+                logger.error(f"Error in cost optimization loop: {str(e)}")
 
 
 async def main():
     """Main function for cost optimization system"""
     logger.info("Starting AI PDF Analysis Cost Optimization System")
     
+    engine = CostOptimizationEngine()
     try:
         # Initialize cost optimization engine
-        engine = CostOptimizationEngine()
         await engine.initialize()
         
         # Run initial optimization
@@ -625,6 +940,8 @@ async def main():
     except Exception as e:
         logger.error(f"Cost optimization system failed: {str(e)}")
         raise
+    finally:
+        await engine.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+WS-242: Batch queue tests for cost-optimization-system.py
+Runs the Redis Lua scripts against fakeredis (which needs lupa for Lua)
+"""
+
+import asyncio
+import importlib.util
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+for dependency in ('numpy', 'redis', 'kubernetes', 'aiohttp', 'lupa'):
+    pytest.importorskip(dependency)
+fakeredis = pytest.importorskip('fakeredis')
+
+# The module name has hyphens, so it is loaded from its path
+_spec = importlib.util.spec_from_file_location(
+    'cost_optimization_system', Path(__file__).with_name('cost-optimization-system.py')
+)
+cost_optimization = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cost_optimization)
+
+ProcessingPriority = cost_optimization.ProcessingPriority
+
+HOUR_MS = 3600 * 1000
+
+def make_processor():
+    """Batch processor on a fresh fakeredis, recording batches instead of POSTing them"""
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    processor = cost_optimization.IntelligentBatchProcessor(redis_client)
+    processor.batches = []
+
+    async def record_batch(batch_jobs, priority, config):
+        processor.batches.append((priority, batch_jobs))
+
+    processor._process_job_batch = record_batch
+    return processor, redis_client
+
+async def push_job(processor, priority, job_id, cost, added_at_ms):
+    """Queue one job with a chosen enqueue time; returns its payload as Redis hands it back"""
+    payload = json.dumps({'job_id': job_id, 'estimated_cost': cost})
+    await processor._push_jobs(processor.batch_queues[priority], added_at_ms, [job_id], [payload], [cost])
+    return payload
+
+async def queue_sizes(processor, priority):
+    """(queue, enqueued index, payloads) entry counts for a tier"""
+    queue_name = processor.batch_queues[priority]
+    return (
+        await processor.redis_client.zcard(queue_name),
+        await processor.redis_client.zcard(processor._enqueued_key(queue_name)),
+        await processor.redis_client.hlen(processor._payloads_key(queue_name)),
+    )
+
+def test_promotion_moves_at_most_the_limit_and_keeps_scores(monkeypatch):
+    async def scenario():
+        processor, redis_client = make_processor()
+        low = processor.batch_queues[ProcessingPriority.LOW_PRIORITY]
+        standard = processor.batch_queues[ProcessingPriority.STANDARD]
+
+        aged_ms = time.time_ns() // 1_000_000 - 2 * HOUR_MS
+        payloads = {}
+        for i in range(5):
+            payloads[f"aged-{i}"] = await push_job(
+                processor, ProcessingPriority.LOW_PRIORITY, f"aged-{i}", 1.0 + i, aged_ms + i)
+        fresh = await push_job(processor, ProcessingPriority.LOW_PRIORITY, 'fresh', 0.5, time.time_ns() // 1_000_000)
+
+        monkeypatch.setattr(cost_optimization, 'PROMOTE_MAX_JOBS', 2)
+        await processor._age_queues()
+
+        # Oldest first, with cost and original enqueue time carried over
+        assert await redis_client.zrange(standard, 0, -1, withscores=True) == [
+            (payloads['aged-0'], 1.0), (payloads['aged-1'], 2.0)
+        ]
+        assert await redis_client.zrange(processor._enqueued_key(standard), 0, -1, withscores=True) == [
+            ('aged-0', aged_ms), ('aged-1', aged_ms + 1)
+        ]
+        assert await redis_client.hgetall(processor._payloads_key(standard)) == {
+            'aged-0': payloads['aged-0'], 'aged-1': payloads['aged-1']
+        }
+        assert await queue_sizes(processor, ProcessingPriority.LOW_PRIORITY) == (4, 4, 4)
+
+        # Later ticks move the rest of the aged jobs and leave the fresh one
+        await processor._age_queues()
+        await processor._age_queues()
+        assert await queue_sizes(processor, ProcessingPriority.STANDARD) == (5, 5, 5)
+        assert await redis_client.zrange(low, 0, -1) == [fresh]
+        assert await queue_sizes(processor, ProcessingPriority.LOW_PRIORITY) == (1, 1, 1)
+
+    asyncio.run(scenario())
+
+def test_drain_leaves_no_index_or_payload_entries():
+    async def scenario():
+        processor, redis_client = make_processor()
+
+        await processor.add_to_batch_queue({'page_count': 3}, ProcessingPriority.URGENT)
+        await processor.add_many_to_batch_queue(
+            [{'page_count': pages} for pages in range(10)], ProcessingPriority.STANDARD)
+        await processor.add_many_to_batch_queue([{'page_count': 1}] * 3, ProcessingPriority.LOW_PRIORITY)
+
+        processed = await processor.process_batch_queues()
+
+        # Urgent and the full standard batch drain; the low tier keeps waiting
+        assert processed == {
+            ProcessingPriority.URGENT: 1,
+            ProcessingPriority.STANDARD: 10,
+            ProcessingPriority.LOW_PRIORITY: 0,
+        }
+        assert await queue_sizes(processor, ProcessingPriority.URGENT) == (0, 0, 0)
+        assert await queue_sizes(processor, ProcessingPriority.STANDARD) == (0, 0, 0)
+        assert await queue_sizes(processor, ProcessingPriority.LOW_PRIORITY) == (3, 3, 3)
+
+        # Cheapest jobs first within a batch
+        standard_batch = dict(processor.batches)[ProcessingPriority.STANDARD]
+        costs = [job['estimated_cost'] for job in standard_batch]
+        assert costs == sorted(costs)
+
+        await processor.aclose()
+
+    asyncio.run(scenario())
+
+def test_flush_error_reaches_every_waiting_caller(monkeypatch):
+    async def scenario():
+        processor, redis_client = make_processor()
+
+        async def failing_flush(items):
+            raise ConnectionError('redis unavailable')
+
+        with monkeypatch.context() as patch:
+            patch.setattr(processor, '_flush_buffered_jobs', failing_flush)
+            results = await asyncio.gather(*(
+                processor.add_to_batch_queue({'page_count': 1}, ProcessingPriority.STANDARD)
+                for _ in range(3)
+            ), return_exceptions=True)
+
+        assert len(results) == 3
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert await queue_sizes(processor, ProcessingPriority.STANDARD) == (0, 0, 0)
+
+        # The flusher survives the failed round trip
+        job_id = await processor.add_to_batch_queue({'page_count': 1}, ProcessingPriority.STANDARD)
+        standard = processor.batch_queues[ProcessingPriority.STANDARD]
+        assert await redis_client.hkeys(processor._payloads_key(standard)) == [job_id]
+
+        await processor.aclose()
+
+    asyncio.run(scenario())